@@ -5,35 +5,60 @@
 import time
 import inspect
 import math
+import queue
 import threading
+import numpy as np
 from typing import Callable
 from arduino.app_internal.core import EdgeImpulseRunnerFacade
-from arduino.app_peripherals.microphone import Microphone
+from arduino.app_peripherals.microphone import AudioBufferPool, Microphone
 from arduino.app_utils import Logger, SlidingWindowBuffer, brick
 
 logger = Logger(__name__)
 
+# Queued on stop() to wake up an inference loop blocked waiting for the next window
+_STOP = object()
+
 
 class AudioDetector(EdgeImpulseRunnerFacade):
     """AudioDetector module for detecting sounds and classifying audio using a specified model."""
 
-    def __init__(self, mic: Microphone = None, confidence: float = 0.8, debounce_sec: float = 2.0):
+    def __init__(
+        self,
+        mic: Microphone = None,
+        confidence: float = 0.8,
+        debounce_sec: float = 2.0,
+        batch_size: int = 1,
+        batch_delay_sec: float = 0.05,
+    ):
         """Initialize the AudioDetector class.
 
         Args:
             mic (Microphone): Microphone instance for audio input. If None, a default Microphone will be initialized.
             confidence (float): Confidence level for detection. Default is 0.8 (80%).
             debounce_sec (float): Minimum seconds between repeated detections of the same keyword. Default is 2.0 seconds.
+            batch_size (int): Maximum number of audio windows sent to the model in a single round. Values greater
+                than 1 trade latency for throughput, the windows being processed in capture order. Default is 1 (no
+                batching, always process the newest window).
+            batch_delay_sec (float): Maximum seconds to wait for a batch to fill up once its first window is ready.
+                Only used when batch_size is greater than 1. Default is 0.05 seconds.
 
         Raises:
-            ValueError: If the model information cannot be retrieved or if the model parameters are incomplete.
+            ValueError: If the model information cannot be retrieved or if the model parameters are incomplete,
+                or if batch_size is not positive.
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+
         super().__init__()
 
         self.confidence = confidence
 
         self._debounce_sec = debounce_sec
         self._last_detected = {}
+        self._debounce_until = 0.0
+
+        self._batch_size = batch_size
+        self._batch_delay_sec = batch_delay_sec
 
         model_info = self.get_model_info()
         if not model_info:
@@ -44,10 +69,23 @@ class AudioDetector(EdgeImpulseRunnerFacade):
 
         self._mic = mic if mic else Microphone(sample_rate=model_info.frequency, channels=model_info.axis_count)
         self._mic_lock = threading.Lock()
+        # Reusable destination for the microphone reads, avoids a new array per audio chunk
+        self._chunk_scratch = np.empty(self._mic.periodsize * self._mic.channels, dtype=self._mic.dtype)
 
         self._window_size = int(model_info.input_features_count / model_info.axis_count)
         self._duration = model_info.input_features_count / model_info.axis_count * model_info.interval_ms
+        # Fail fast on a hung runner: a late result is worthless as fresher audio is already waiting
+        self._http_timeout = (0.5, max(0.2, self._duration / 1000.0 * 2))
         self._buffer = SlidingWindowBuffer(self._window_size, slide_amount=math.floor(self._window_size * 0.4))
+        # Ready windows are handed to the inference loop newest-first without batching, in capture order with it so
+        # that the results and the debounce follow the audio. Stale ones are dropped when the loop lags behind.
+        if batch_size > 1:
+            self._windows = queue.Queue(maxsize=2 * batch_size)
+        else:
+            self._windows = queue.LifoQueue(maxsize=2)
+        # Windows are pulled into recycled buffers, given back once inferred or dropped: enough of them for a full
+        # queue, the batch being inferred and the window being pulled
+        self._window_pool = AudioBufferPool(self._windows.maxsize + batch_size + 1, self._window_size, self._mic.dtype)
 
         self.handlers = {}  # Dictionary to hold handlers for different keywords
         self.handlers_lock = threading.Lock()
@@ -63,10 +101,13 @@ class AudioDetector(EdgeImpulseRunnerFacade):
             TypeError: If callback is not callable.
             ValueError: If callback accepts any argument.
         """
-        if not inspect.isfunction(callback):
+        if not callable(callback):
             raise TypeError("Callback must be a callable function.")
-        sig_args = inspect.signature(callback).parameters
-        if len(sig_args) > 0:
+        try:
+            sig_args = inspect.signature(callback).parameters
+        except (ValueError, TypeError):
+            sig_args = None  # Signature not available (e.g. some built-ins), can't validate it
+        if sig_args:
             raise ValueError("Callback must not accept any arguments.")
 
         keyword = keyword.lower()
@@ -77,6 +118,7 @@ class AudioDetector(EdgeImpulseRunnerFacade):
 
     def start(self):
         self._buffer.flush()
+        self._drain_windows()
         with self._mic_lock:
             self._mic.start()
 
@@ -84,6 +126,8 @@ class AudioDetector(EdgeImpulseRunnerFacade):
         with self._mic_lock:
             self._mic.stop()
         self._buffer.flush()
+        self._drain_windows()
+        self._put_window(_STOP)
 
     @staticmethod
     def get_best_match(item: dict, confidence: float) -> tuple[str, float] | None:
@@ -102,32 +146,41 @@ class AudioDetector(EdgeImpulseRunnerFacade):
         if confidence is None:
             raise ValueError("Confidence level must be provided.")
 
-        classification = _extract_classification(item, confidence)
-        if not classification:
+        if not item or "result" not in item:
+            return None
+        class_results = item["result"]
+        if not class_results or "classification" not in class_results:
             return None
 
-        best_matched_keyword = None
-        best_matched_keyword_confidence = 0.0
-
-        for possible_keyword in classification:
-            keyword_name = possible_keyword["class_name"]
-            keyword_confidence = float(possible_keyword["confidence"])
+        classification = class_results["classification"]
+        if not classification:
+            return None
 
-            if keyword_confidence > best_matched_keyword_confidence:
-                best_matched_keyword = keyword_name
-                best_matched_keyword_confidence = keyword_confidence
+        # Argmax over the raw scores in C, no intermediate list or string formatting
+        scores = np.fromiter(classification.values(), dtype=np.float64, count=len(classification))
+        best_index = int(scores.argmax())
+        best_matched_keyword_confidence = float(scores[best_index])
+        if best_matched_keyword_confidence < confidence or best_matched_keyword_confidence <= 0.0:
+            return None
 
+        best_matched_keyword = list(classification)[best_index]
+        best_matched_keyword_confidence *= 100.0  # Convert to percentage
         return best_matched_keyword, best_matched_keyword_confidence
 
     @brick.loop
     def _read_mic_loop(self):
         try:
             with self._mic_lock:
-                stream = self._mic.stream()
-                for chunk in stream:
-                    if chunk is None:
-                        continue
-                    self._buffer.push(chunk)
+                stream = self._mic.stream_into(self._chunk_scratch)
+                for n in stream:
+                    self._buffer.push(self._chunk_scratch[:n])
+                    while self._buffer.has_data():
+                        buf = self._window_pool.acquire()
+                        window = self._buffer.pull(timeout=0, out=buf)
+                        if window is buf:
+                            self._put_window(window)
+                        else:
+                            self._window_pool.release(buf)  # Flushed by stop() since has_data()
         except StopIteration:
             raise
         except Exception:
@@ -136,65 +189,108 @@ class AudioDetector(EdgeImpulseRunnerFacade):
 
     @brick.loop
     def _inference_loop(self):
-        now = time.time()
-        # If in debounce period, skip the inference
-        if hasattr(self, "_debounce_until") and now < self._debounce_until:
-            time.sleep(0.05)
+        now = time.monotonic()
+        # If in debounce period, skip the inference and drop the windows piling up, so that the first
+        # inference after the debounce period runs on fresh audio
+        if now < self._debounce_until:
+            self._drain_windows()
+            time.sleep(min(0.1, self._debounce_until - now))
             return
 
-        features = self._buffer.pull()
-        if len(features) == 0:
+        if self._batch_size > 1:
+            batch = self._get_window_batch(timeout=0.5)
+        else:
+            features = self._get_latest_window(timeout=0.5)
+            batch = [features] if features is not None else []
+        if not batch:
             return
 
-        logger.debug(f"Processing sensor data with {len(features)} features.")
+        logger.debug("Processing sensor data with %d window(s) of %d features.", len(batch), len(batch[0]))
         try:
-            ret = self.infer_from_features(features.tolist())
-            spotted_keyword = self.get_best_match(ret, self.confidence)
-            if spotted_keyword:
-                keyword, confidence = spotted_keyword
-                keyword = keyword.lower()
-                logger.debug(f"Keyword '{keyword}' detected with confidence {confidence:2f}%.")
-                callback = None
-                with self.handlers_lock:
-                    if keyword in self.handlers:
-                        callback = self.handlers[keyword]
-
-                if callback:
-                    last_time = self._last_detected.get(keyword, 0)
-                    if now - last_time >= self._debounce_sec:
-                        self._last_detected[keyword] = now
-                        logger.debug(f"Invoking callback for keyword '{keyword}'.")
-                        callback()
-                    else:
-                        self._debounce_until = now + self._debounce_sec
+            results = self.infer_from_features_batch(batch, timeout=self._http_timeout)
+            for ret in results:
+                self._handle_result(ret, now)
         except Exception as e:
             logger.exception(f"Error running inference: {e}")
             time.sleep(1)  # Sleep briefly to avoid tight loop in case of errors
+        finally:
+            for window in batch:
+                self._window_pool.release(window)
+
+    def _handle_result(self, ret: dict | None, now: float):
+        """Invoke the handler of the best matched keyword in an inference result, honoring the debounce period."""
+        spotted_keyword = self.get_best_match(ret, self.confidence)
+        if spotted_keyword:
+            keyword, confidence = spotted_keyword
+            keyword = keyword.lower()
+            logger.debug("Keyword '%s' detected with confidence %2f%%.", keyword, confidence)
+            callback = None
+            with self.handlers_lock:
+                if keyword in self.handlers:
+                    callback = self.handlers[keyword]
+
+            if callback:
+                last_time = self._last_detected.get(keyword, float("-inf"))
+                if now - last_time >= self._debounce_sec:
+                    self._last_detected[keyword] = now
+                    logger.debug("Invoking callback for keyword '%s'.", keyword)
+                    callback()
+                else:
+                    self._debounce_until = now + self._debounce_sec
+
+    def _put_window(self, window):
+        """Hand a ready window to the inference loop, discarding the stale ones if it is lagging behind."""
+        try:
+            self._windows.put_nowait(window)
+        except queue.Full:
+            self._drain_windows()
+            self._windows.put_nowait(window)
 
+    def _get_latest_window(self, timeout: float):
+        """Return the freshest ready window, dropping any older backlog, or None if none arrives within timeout."""
+        try:
+            window = self._windows.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self._drain_windows()
+        return window if window is not _STOP else None
 
-def _extract_classification(item, confidence: float) -> list | None:
-    if not item:
-        return None
-
-    if "result" in item:
-        class_results = item["result"]
-        if class_results and "classification" in class_results:
-            class_results = class_results["classification"]
-
-            classification = []
-            for class_name in class_results:
-                class_confidence = float(class_results[class_name])
-
-                if class_confidence < confidence:
-                    continue
-
-                class_confidence *= 100.0  # Convert to percentage
-                obj = {
-                    "class_name": class_name,
-                    "confidence": f"{class_confidence:.2f}",
-                }
-                classification.append(obj)
-
-            return classification
+    def _get_window_batch(self, timeout: float) -> list:
+        """Collect up to batch_size ready windows.
 
-    return None
+        Blocks up to timeout for the first window, then up to batch_delay_sec for the batch to fill up.
+        """
+        try:
+            window = self._windows.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        if window is _STOP:
+            return []
+        batch = [window]
+
+        deadline = time.monotonic() + self._batch_delay_sec
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    window = self._windows.get(timeout=remaining)
+                else:
+                    window = self._windows.get_nowait()
+            except queue.Empty:
+                break
+            if window is _STOP:
+                break
+            batch.append(window)
+
+        return batch
+
+    def _drain_windows(self):
+        # Drop every pending window under a single lock acquisition instead of one get_nowait() per item
+        with self._windows.mutex:
+            for window in self._windows.queue:
+                if window is not _STOP:
+                    self._window_pool.release(window)
+            self._windows.queue.clear()
+            self._windows.unfinished_tasks = 0
+            self._windows.all_tasks_done.notify_all()
+            self._windows.not_full.notify_all()
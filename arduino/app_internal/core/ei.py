@@ -2,14 +2,44 @@
 #
 # SPDX-License-Identifier: MPL-2.0
 
+import atexit
 import requests
 import io
+import json
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from arduino.app_internal.core import load_brick_compose_file, resolve_address
 from arduino.app_utils import get_image_bytes, get_image_type, HttpClient
 from arduino.app_utils import Logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard json encoder
+    orjson = None
+
 logger = Logger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# (connect, read) timeouts in seconds, so that a hung runner can't stall the caller indefinitely
+DEFAULT_INFERENCE_TIMEOUT = (0.5, 5.0)
+# Files given by path may be large, leave more time to upload and process them
+FILE_INFERENCE_TIMEOUT = (0.5, 30.0)
+MODEL_INFO_TIMEOUT = (0.5, 2.0)
+
+# Maximum number of concurrent requests to the runner, sizes both the connection pool and the batch workers
+_MAX_CONCURRENT_REQUESTS = 4
+
+
+def _json_response(response: requests.Response):
+    """Decode a JSON response body, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class EdgeImpulseModelInfo:
     """Class to hold Edge Impulse model information."""
@@ -41,6 +71,17 @@ class EdgeImpulseModelInfo:
 class EdgeImpulseRunnerFacade:
     """Facade for Edge Impulse Object Detection and Classification."""
 
+    # Shared keep-alive session, lazily created and reused by every inference call
+    _session: requests.Session | None = None
+    _batch_executor: ThreadPoolExecutor | None = None
+    _session_lock = threading.Lock()
+
+    # Model info is immutable for the lifetime of a runner, cache it by base URL
+    _model_info_cache: dict[str, EdgeImpulseModelInfo] = {}
+
+    # Runner URL resolved from the Brick Compose file, per brick class
+    _ei_url_cache: dict[type, str] = {}
+
     def __init__(self):
         """Initialize the EdgeImpulseRunnerFacade with the API path.
 
@@ -48,19 +89,72 @@ class EdgeImpulseRunnerFacade:
             RuntimeError: If the Edge Impulse runner address cannot be resolved.
         """
         self.url = self._get_ei_url()
+        self._api_image_url = f"{self.url}/api/image"
+        self._http_timeout = DEFAULT_INFERENCE_TIMEOUT
         logger.info(f"[{self.__class__.__name__}] URL: {self.url}")
 
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Return the pooled HTTP session shared by all the facade instances, creating it on first use."""
+        session = EdgeImpulseRunnerFacade._session
+        if session is not None:
+            return session
+
+        with EdgeImpulseRunnerFacade._session_lock:
+            if EdgeImpulseRunnerFacade._session is None:
+                # Only retry on connection errors: inference requests must not be replayed on read failures
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=_MAX_CONCURRENT_REQUESTS,
+                    pool_block=False,
+                    max_retries=Retry(connect=2, read=0, backoff_factor=0.1),
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                EdgeImpulseRunnerFacade._session = session
+            return EdgeImpulseRunnerFacade._session
+
+    @classmethod
+    def _get_batch_executor(cls) -> ThreadPoolExecutor:
+        """Return the thread pool used to fan out batched inference requests, creating it on first use."""
+        with EdgeImpulseRunnerFacade._session_lock:
+            if EdgeImpulseRunnerFacade._batch_executor is None:
+                EdgeImpulseRunnerFacade._batch_executor = ThreadPoolExecutor(
+                    max_workers=_MAX_CONCURRENT_REQUESTS, thread_name_prefix="EdgeImpulseBatch"
+                )
+                # Shared by every facade instance, so it lives as long as the process
+                atexit.register(EdgeImpulseRunnerFacade._batch_executor.shutdown, wait=False)
+            return EdgeImpulseRunnerFacade._batch_executor
+
+    @classmethod
+    def close_session(cls):
+        """Close the shared HTTP session. It's recreated on the next inference call.
+
+        The session is shared by every facade instance in the process: this is meant for process teardown, not for
+        stopping a single brick, as it would break the requests of the other instances.
+        """
+        with EdgeImpulseRunnerFacade._session_lock:
+            if EdgeImpulseRunnerFacade._session is not None:
+                EdgeImpulseRunnerFacade._session.close()
+                EdgeImpulseRunnerFacade._session = None
+
     def infer_from_file(self, image_path: str) -> dict | None:
+        """Run the inference on an image file, with a longer read timeout than the other inference calls
+        (FILE_INFERENCE_TIMEOUT) as the file may be large.
+        """
         if not image_path or image_path == "":
             return None
         with open(image_path, "rb") as f:
             try:
-                return self.infer_from_image(image_bytes=f.read(), image_type=image_path.split(".")[-1])
+                return self.infer_from_image(image_bytes=f.read(), image_type=image_path.split(".")[-1], timeout=FILE_INFERENCE_TIMEOUT)
             except Exception as e:
                 logger.error(f"Error: {e}")
                 return None
 
-    def infer_from_image(self, image_bytes, image_type: str = "jpg") -> dict | None:
+    def infer_from_image(
+        self, image_bytes, image_type: str = "jpg", timeout: float | tuple[float, float] | None = None
+    ) -> dict | None:
         image_bytes = get_image_bytes(image_bytes)
         if not image_bytes or not image_type:
             return None
@@ -72,18 +166,23 @@ class EdgeImpulseRunnerFacade:
             image_type = "jpeg"
 
         try:
-            logger.debug(f"[{self.__class__.__name__}] Detecting image of type: {image_type} -> {len(image_bytes)} bytes")
+            logger.debug("[%s] Detecting image of type: %s -> %d bytes", self.__class__.__name__, image_type, len(image_bytes))
 
             files = {"file": (f"image.{image_type}", io.BytesIO(image_bytes), f"image/{image_type}")}
-            response = requests.post(f"{self.url}/api/image", files=files)
+            if timeout is None:
+                timeout = self._http_timeout
+            response = self._get_session().post(self._api_image_url, files=files, timeout=timeout)
 
+        except requests.Timeout:
+            logger.warning(f"[{self.__class__.__name__}] Inference timed out, discarding image.")
+            return None
         except Exception as e:
             logger.error(f"[{self.__class__.__name__}] Error: {e}")
             return None
 
         # Check the response
         if response.status_code == 200:
-            return response.json()
+            return _json_response(response)
         else:
             logger.warning(f"[{self.__class__}] error: {response.status_code}. Message: {response.text}")
             return None
@@ -98,8 +197,7 @@ class EdgeImpulseRunnerFacade:
         try:
             if isinstance(item, str):
                 # Use this like a file path
-                with open(item, "rb") as f:
-                    return self.infer_from_image(f.read(), item.split(".")[-1])
+                return self.infer_from_file(item)
             elif isinstance(item, dict) and "image" in item and item["image"] != "":
                 image = item["image"]
                 if "image_type" in item and item["image_type"] != "":
@@ -120,13 +218,17 @@ class EdgeImpulseRunnerFacade:
         return None
 
     @classmethod
-    def infer_from_features(cls, features: list) -> dict | None:
+    def infer_from_features(
+        cls, features: list | np.ndarray, timeout: float | tuple[float, float] = DEFAULT_INFERENCE_TIMEOUT
+    ) -> dict | None:
         """
         Infer from features using the Edge Impulse API.
 
         Args:
             cls: The class method caller.
-            features (list): A list of features to send to the Edge Impulse API.
+            features (list | np.ndarray): The features to send to the Edge Impulse API. NumPy arrays are
+                serialized directly, without going through an intermediate Python list, when orjson is available.
+            timeout (float | tuple[float, float]): The request timeout in seconds, or a (connect, read) tuple.
 
         Returns:
             dict | None: The response from the Edge Impulse API as a dictionary, or None if an error occurs.
@@ -136,16 +238,53 @@ class EdgeImpulseRunnerFacade:
             model_info = cls.get_model_info(url)
             features = features[: int(model_info.input_features_count)]
 
-            response = requests.post(f"{url}/api/features", json={"features": features})
+            session = cls._get_session()
+            if orjson is not None:
+                if isinstance(features, np.ndarray):
+                    features = np.ascontiguousarray(features)
+                body = orjson.dumps({"features": features}, option=orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                if isinstance(features, np.ndarray):
+                    features = features.tolist()
+                # Compact separators, the default ", " adds a byte per feature to the request body
+                body = json.dumps({"features": features}, separators=(",", ":"))
+            response = session.post(f"{url}/api/features", data=body, headers=_JSON_HEADERS, timeout=timeout)
             if response.status_code == 200:
-                return response.json()
+                return _json_response(response)
             else:
                 logger.warning(f"[{cls.__name__}] error: {response.status_code}. Message: {response.text}")
                 return None
+        except requests.Timeout:
+            logger.warning(f"[{cls.__name__}] Inference timed out, discarding features.")
+            return None
         except Exception as e:
             logger.error(f"[{cls.__name__}] Error: {e}")
             return None
 
+    @classmethod
+    def infer_from_features_batch(
+        cls, batch: list, timeout: float | tuple[float, float] = DEFAULT_INFERENCE_TIMEOUT
+    ) -> list[dict | None]:
+        """
+        Infer from several feature windows at once using the Edge Impulse API.
+
+        The runner has no batch endpoint, so the windows are sent concurrently over the pooled session,
+        amortizing the per-request latency across the batch.
+
+        Args:
+            cls: The class method caller.
+            batch (list): A list of feature windows, each accepted by infer_from_features.
+            timeout (float | tuple[float, float]): The request timeout in seconds, or a (connect, read) tuple.
+
+        Returns:
+            list[dict | None]: The responses from the Edge Impulse API, in the same order as the batch.
+        """
+        if len(batch) <= 1:
+            return [cls.infer_from_features(features, timeout=timeout) for features in batch]
+
+        executor = cls._get_batch_executor()
+        return list(executor.map(lambda features: cls.infer_from_features(features, timeout=timeout), batch))
+
     @classmethod
     def get_model_info(cls, url: str = None) -> EdgeImpulseModelInfo | None:
         """Get model information from the Edge Impulse API.
@@ -160,12 +299,18 @@ class EdgeImpulseRunnerFacade:
         if not url:
             url = cls._get_ei_url()
 
+        model_info = EdgeImpulseRunnerFacade._model_info_cache.get(url)
+        if model_info is not None:
+            return model_info
+
         http_client = HttpClient(total_retries=6)  # Initialize the HTTP client with retry logic
         try:
-            response = http_client.request_with_retry(f"{url}/api/info")
+            response = http_client.request_with_retry(f"{url}/api/info", timeout=MODEL_INFO_TIMEOUT)
             if response.status_code == 200:
                 logger.debug(f"[{cls.__name__}] Fetching model info from {url}/api/info -> {response.status_code} {response.json}")
-                return EdgeImpulseModelInfo(response.json())
+                model_info = EdgeImpulseModelInfo(_json_response(response))
+                EdgeImpulseRunnerFacade._model_info_cache[url] = model_info
+                return model_info
             else:
                 logger.warning(f"[{cls}] Error fetching model info: {response.status_code}. Message: {response.text}")
                 return None
@@ -246,6 +391,14 @@ class EdgeImpulseRunnerFacade:
 
     @classmethod
     def _get_ei_url(cls):
+        url = EdgeImpulseRunnerFacade._ei_url_cache.get(cls)
+        if url is None:
+            url = cls._resolve_ei_url()
+            EdgeImpulseRunnerFacade._ei_url_cache[cls] = url
+        return url
+
+    @classmethod
+    def _resolve_ei_url(cls):
         infra = load_brick_compose_file(cls)
         if not infra or "services" not in infra:
             raise RuntimeError("Cannot load Brick Compose file to resolve Edge Impulse runner address.")
@@ -8,10 +8,25 @@ import yaml
 import sys
 from typing import List, Dict, Optional
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml, use the pure Python loader
+    from yaml import SafeLoader as _SafeLoader
+
 application_config_file_name: str = "app.yaml"
 config_file_name: str = "brick_config.yaml"
 compose_config_file_name: str = "brick_compose.yaml"
 
+_DOCKER_VAR_RE = re.compile(r"\${([^:]+)(:\-)?([^}]+)?}")
+_EI_RUNNER_RE = re.compile(r"ei-models-runner:[0-9]+\.[0-9]+\.[0-9]+")
+_APPSLAB_VER_DEFAULT_RE = re.compile(r"\${APPSLAB_VERSION:\-([^}]+)?}")
+_APPSLAB_VER_RE = re.compile(r"\${APPSLAB_VERSION}")
+_DOCKER_REG_DEFAULT_RE = re.compile(r"\${DOCKER_REGISTRY_BASE:\-([^}]+)?}")
+_DOCKER_REG_RE = re.compile(r"\${DOCKER_REGISTRY_BASE}")
+
+# Parsed brick_compose.yaml files, keyed by path. These files are part of the installed bricks and never change.
+_compose_file_cache: Dict[str, Dict] = {}
+
 
 def get_app_config() -> Optional[Dict]:
     """Gets app.yaml application configuration."""
@@ -33,7 +48,7 @@ def get_app_config() -> Optional[Dict]:
 
     if config_path and os.path.exists(config_path):
         with open(config_path) as f:
-            config_content = yaml.safe_load(f)
+            config_content = yaml.load(f, Loader=_SafeLoader)
             return config_content
 
     return None
@@ -50,12 +65,18 @@ def get_brick_compose_file(cls) -> Optional[str]:
 
 
 def load_brick_compose_file(cls) -> Optional[Dict]:
-    """Loads the brick_compose.yaml file and returns its content."""
+    """Loads the brick_compose.yaml file and returns its content.
+
+    The parsed content is cached per file and shared between callers, it must not be modified.
+    """
     pathfile = get_brick_compose_file(cls)
     if pathfile:
-        with open(pathfile) as f:
-            compose_content = yaml.safe_load(f)
-            return compose_content
+        compose_content = _compose_file_cache.get(pathfile)
+        if compose_content is None:
+            with open(pathfile) as f:
+                compose_content = yaml.load(f, Loader=_SafeLoader)
+            _compose_file_cache[pathfile] = compose_content
+        return compose_content
     else:
         return None
 
@@ -94,7 +115,7 @@ def parse_docker_compose_variable(variable_string) -> List[tuple[str, str]] | st
         A list of tuple containing the variable name and the default value (if present), or the original
         string if parsing fails.
     """
-    matches = re.findall(r"\${([^:]+)(:\-)?([^}]+)?}", variable_string)
+    matches = _DOCKER_VAR_RE.findall(variable_string)
     if matches:
         results = []
         for match in matches:
@@ -111,24 +132,18 @@ def parse_docker_compose_variable(variable_string) -> List[tuple[str, str]] | st
         return variable_string
 
 
-def _accumulate_docker_compose_variables(discovered_vars, value):
-    if isinstance(value, str):
-        tp = parse_docker_compose_variable(value)
-        if tp and isinstance(tp, list):
-            for t in tp:
-                discovered_vars.append(t)
-    elif isinstance(value, dict):
-        for k, val in value.items():
-            tp = parse_docker_compose_variable(val)
-            if tp and isinstance(tp, list):
-                for t in tp:
-                    discovered_vars.append(t)
-    elif isinstance(value, list):
-        for val in value:
-            tp = parse_docker_compose_variable(val)
-            if tp and isinstance(tp, list):
-                for t in tp:
-                    discovered_vars.append(t)
+def _accumulate_docker_compose_variables(discovered_vars: set, node):
+    """Recursively collects the (name, default value) of the variables referenced in a parsed compose node."""
+    if isinstance(node, str):
+        variables = parse_docker_compose_variable(node)
+        if isinstance(variables, list):
+            discovered_vars.update(variables)
+    elif isinstance(node, dict):
+        for value in node.values():
+            _accumulate_docker_compose_variables(discovered_vars, value)
+    elif isinstance(node, list):
+        for value in node:
+            _accumulate_docker_compose_variables(discovered_vars, value)
 
 
 class ModuleVariable:
@@ -191,46 +206,31 @@ def load_module_supported_variables(file_path: str) -> Optional[List[ModuleVaria
     """
     try:
         with open(file_path, "r") as file:
-            # Read the file content to get headers
-            descriptions: Dict[str, str] = {}
-            while True:
-                line = file.readline()
-                if not line:  # End of file
-                    break
-
-                line = line.rstrip("\n")
-                if not line.startswith("#"):
-                    continue
-                pieces = line[1:].strip().split("=")
-                if len(pieces) < 2:
-                    continue
-                descriptions[pieces[0].strip()] = pieces[1].strip()
-
-            file.seek(0)  # Reset file pointer to the beginning
             content = file.read()
-            docker_c = yaml.safe_load(content)
-
-            discovered_vars = []
-            if "services" in docker_c:
-                for service in docker_c["services"]:
-                    for key, value in docker_c["services"][service].items():
-                        if isinstance(value, str):
-                            _accumulate_docker_compose_variables(discovered_vars, value)
-                        elif isinstance(value, list):
-                            for v in value:
-                                _accumulate_docker_compose_variables(discovered_vars, v)
-                        elif isinstance(value, dict):
-                            for k, v in value.items():
-                                _accumulate_docker_compose_variables(discovered_vars, v)
-
-            if len(discovered_vars) > 0:
-                out_vars = []
-                discovered_vars = list(set(discovered_vars))
-                for name, default_value in sorted(discovered_vars):
-                    out_vars.append(ModuleVariable(name, descriptions.get(name, None), default_value))
-                return out_vars
 
-            return None
+        # Parse the comment headers to get the variable descriptions
+        descriptions: Dict[str, str] = {}
+        for line in content.splitlines():
+            if not line.startswith("#"):
+                continue
+            pieces = line[1:].strip().split("=")
+            if len(pieces) < 2:
+                continue
+            descriptions[pieces[0].strip()] = pieces[1].strip()
+
+        docker_c = yaml.load(content, Loader=_SafeLoader)
+
+        discovered_vars = set()
+        if "services" in docker_c:
+            _accumulate_docker_compose_variables(discovered_vars, docker_c["services"])
+
+        if len(discovered_vars) > 0:
+            out_vars = []
+            for name, default_value in sorted(discovered_vars):
+                out_vars.append(ModuleVariable(name, descriptions.get(name, None), default_value))
+            return out_vars
+
+        return None
     except FileNotFoundError:
         return None
 
@@ -268,16 +268,16 @@ def _update_compose_release_version(
 
     if only_ei_containers:
         substitution = "ei-models-runner:" + release_version
-        updated_content = re.sub(r"ei-models-runner:[0-9]+\.[0-9]+\.[0-9]+", substitution, updated_content)
+        updated_content = _EI_RUNNER_RE.sub(substitution, updated_content)
 
     substitution = release_version
-    updated_content = re.sub(r"\${APPSLAB_VERSION:\-([^}]+)?}", substitution, updated_content)
-    updated_content = re.sub(r"\${APPSLAB_VERSION}", substitution, updated_content)
+    updated_content = _APPSLAB_VER_DEFAULT_RE.sub(substitution, updated_content)
+    updated_content = _APPSLAB_VER_RE.sub(substitution, updated_content)
 
     if registry and registry != "":
         substitution = "${DOCKER_REGISTRY_BASE:-" + registry + "}"
-        updated_content = re.sub(r"\${DOCKER_REGISTRY_BASE:\-([^}]+)?}", substitution, updated_content)
-        updated_content = re.sub(r"\${DOCKER_REGISTRY_BASE}", substitution, updated_content)
+        updated_content = _DOCKER_REG_DEFAULT_RE.sub(substitution, updated_content)
+        updated_content = _DOCKER_REG_RE.sub(substitution, updated_content)
 
     if append_suffix:
         compose_file_path = compose_file_path + ".new"
@@ -2,7 +2,8 @@
 #
 # SPDX-License-Identifier: MPL-2.0
 
+from .adapter import fast_lifecycle
 from .pipeline import Pipeline
 
 
-__all__ = ["Pipeline"]
+__all__ = ["Pipeline", "fast_lifecycle"]
@@ -3,57 +3,128 @@
 # SPDX-License-Identifier: MPL-2.0
 
 import asyncio
-import queue
+import functools
 import threading
-from typing import Any, Optional
-from .constants import _SHUTDOWN
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
 from .limiter import AsyncRateLimiter
 from arduino.app_utils import Logger
 
 logger = Logger("pipeline.adapter")
 
 
+def _is_coro(method: Any) -> bool:
+    """Whether calling method returns a coroutine, with the answer cached per underlying function.
+
+    Bound methods are a new object at every attribute access, and keying the cache on them would also keep the bricks
+    alive, so they are unwrapped to the plain function first: instances of the same brick class share the result.
+    """
+    func = getattr(method, "__func__", method)
+    while isinstance(func, functools.partial):
+        func = func.func
+    try:
+        return _is_coro_function(func)
+    except TypeError:  # Unhashable callable
+        return asyncio.iscoroutinefunction(func)
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_coro_function(func: Any) -> bool:
+    return asyncio.iscoroutinefunction(func)
+
+
+def fast_lifecycle(func: Callable) -> Callable:
+    """Method decorator that marks a sync start or stop method as quick and non-blocking (e.g. it only sets a flag).
+    The pipeline will call it directly on its event loop thread, instead of going through the executor.
+    """
+    func._is_fast_lifecycle = True
+    return func
+
+
+async def _call_inline(method: Callable, *args: Any) -> Any:
+    return method(*args)
+
+
 # These classes are used to adapt the original bricks to the asyncio API. They are responsible for wrapping the original
 # bricks and providing a consistent interface for the pipeline.
 
 
 class AsyncBrickAdapter:
-    """Base class for brick adapters, normalizing to an async API."""
+    """Base class for brick adapters, normalizing to an async API.
+
+    The brick is fixed for the whole adapter lifetime, so its methods are looked up and classified as sync or async
+    once, in __init__, leaving no reflection on the per-item path.
+    """
 
     def __init__(self, original_brick: Any, rate_limit: Optional[int] = None):
         self.original_brick = original_brick
         self.rate_limit = rate_limit
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._brick_name = type(original_brick).__name__
 
-    def set_loop(self, loop: asyncio.AbstractEventLoop):
-        self._loop = loop
+        # The start and stop methods are optional
+        self._start_call = self._resolve_optional("start")
+        self._stop_call = self._resolve_optional("stop")
 
     async def start(self):
         """Normalized async start method."""
-        logger.debug(f"Running start method for {type(self.original_brick).__name__}")
-        return await self._execute_maybe_sync("start")
+        logger.debug(f"Running start method for {self._brick_name}")
+        if self._start_call is not None:
+            return await self._start_call()
 
     async def stop(self):
         """Normalized async stop method."""
-        logger.debug(f"Starting stop method for {type(self.original_brick).__name__}")
-        return await self._execute_maybe_sync("stop")
+        logger.debug(f"Starting stop method for {self._brick_name}")
+        if self._stop_call is not None:
+            return await self._stop_call()
 
-    async def _execute_maybe_sync(self, method_name: str, *args: Any) -> Any:
-        """Helper to execute a method, handling sync/async via executor."""
-        if not self._loop:
-            raise RuntimeError("Loop not set for adapter execution")
+    def _resolve_optional(self, method_name: str) -> Optional[Callable[..., Awaitable]]:
+        """Return a caller for an optional method of the brick, or None if the brick doesn't define it."""
         if not hasattr(self.original_brick, method_name):
-            # The start and stop methods are optional
-            return
-
+            return None
         method = getattr(self.original_brick, method_name)
         if not callable(method):
-            raise TypeError(f"Method {method_name} is not callable on {type(self.original_brick).__name__}")
+            raise TypeError(f"Method {method_name} is not callable on {self._brick_name}")
+        if getattr(method, "_is_fast_lifecycle", False) and not _is_coro(method):
+            return functools.partial(_call_inline, method)
+        return self._make_caller(method)
+
+    def _make_caller(self, method: Callable) -> Callable[..., Awaitable]:
+        """Return a callable producing an awaitable for method: the method itself if async, an executor call if sync."""
+        if _is_coro(method):
+            return method
+        return functools.partial(self._run_in_executor, method)
+
+    def _specialize(self, method: Callable, inline: bool = False) -> Callable[..., Awaitable]:
+        """Build the per-item call of method, with the rate limit and sync/async dispatch resolved once here instead of
+        being tested at every call. Must be called after self._limiter is set.
+        """
+        limiter = self._limiter
+        if not inline:
+            call = self._make_caller(method)
+            if limiter is None:
+                return call
 
-        if asyncio.iscoroutinefunction(method):
-            return await method(*args)
-        else:
-            return await self._loop.run_in_executor(None, method, *args)
+            async def limited_call(*args: Any) -> Any:
+                delay = limiter.try_acquire()
+                if delay:
+                    await asyncio.sleep(delay)
+                return await call(*args)
+
+            return limited_call
+
+        if limiter is None:
+            return functools.partial(_call_inline, method)
+
+        async def limited_inline_call(*args: Any) -> Any:
+            delay = limiter.try_acquire()
+            if delay:
+                await asyncio.sleep(delay)
+            return method(*args)
+
+        return limited_inline_call
+
+    def _run_in_executor(self, method: Callable, *args: Any) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(None, method, *args)
 
 
 class AsyncSourceAdapter(AsyncBrickAdapter):
@@ -63,34 +134,42 @@ class AsyncSourceAdapter(AsyncBrickAdapter):
         super().__init__(original_brick, rate_limit)
 
         self._produce_method = getattr(self.original_brick, "produce", None)
-        if not callable(self._produce_method) or not asyncio.iscoroutinefunction(self._produce_method):
-            raise TypeError(f"Method 'produce' not found or not async on {type(self.original_brick).__name__}")
+        if not callable(self._produce_method) or not _is_coro(self._produce_method):
+            raise TypeError(f"Method 'produce' not found or not async on {self._brick_name}")
         self._limiter = AsyncRateLimiter(rate_limit) if rate_limit else None
-
-    async def produce(self, *args: Any) -> Any:
-        """Normalized async produce, calls original async method."""
-        if self._limiter:
-            await self._limiter.wait()
-        return await self._produce_method(*args)
+        # Normalized async produce, calls original async method
+        self.produce = self._specialize(self._produce_method)
 
 
 class AsyncBlockingSourceAdapter(AsyncBrickAdapter):
     """Adapter for synchronous sources that might block indefinitely.
     Manages a daemon thread internally to avoid blocking the event loop.
+
+    The produce method is deliberately not run through run_in_executor/asyncio.to_thread: a call that never returns
+    would pin an executor worker forever, and executor workers are joined at interpreter exit, so a stuck source
+    would also hang the shutdown. A daemon thread can simply be abandoned. Items still reach the event loop with a
+    single call_soon_threadsafe wakeup, without any executor round trip.
     """
 
     def __init__(self, original_brick: Any, rate_limit: Optional[int] = None):
         super().__init__(original_brick, rate_limit)
 
         self._produce_method = getattr(self.original_brick, "produce", None)
-        if not callable(self._produce_method) or asyncio.iscoroutinefunction(self._produce_method):
-            raise TypeError(f"Method 'produce' not found or async on {type(self.original_brick).__name__}")
+        if not callable(self._produce_method) or _is_coro(self._produce_method):
+            raise TypeError(f"Method 'produce' not found or async on {self._brick_name}")
 
         # Dedicated limiter for the data emission by this adapter
         self._limiter = AsyncRateLimiter(rate_limit) if rate_limit else None
 
-        # Internal queue for daemon thread -> async communication
-        self._data_queue = queue.Queue(1)
+        # Single slot handoff for daemon thread -> async communication. The thread appends an item and wakes up the
+        # event loop through _item_ready, then waits on _consumed before producing the next one (backpressure).
+        # The end of the stream is signaled out of band: _closed is set, then _item_ready to wake up produce().
+        self._data_deque = deque(maxlen=1)
+        self._item_ready: Optional[asyncio.Event] = None
+        self._closed = True
+        # Loop running produce(), captured at start for the producer thread's call_soon_threadsafe wakeups
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._consumed = threading.Event()
         self._stop_event = threading.Event()
         self._producer_thread: Optional[threading.Thread] = None
 
@@ -100,17 +179,17 @@ class AsyncBlockingSourceAdapter(AsyncBrickAdapter):
 
         if self._producer_thread is None or not self._producer_thread.is_alive():
             self._stop_event.clear()
-            # Clear queue in case of restart
-            while not self._data_queue.empty():
-                try:
-                    self._data_queue.get_nowait()
-                except queue.Empty:
-                    break
+            # Reset the handoff in case of restart
+            self._data_deque.clear()
+            self._loop = asyncio.get_running_loop()
+            self._item_ready = asyncio.Event()
+            self._closed = False
+            self._consumed.set()
             self._producer_thread = threading.Thread(
-                target=self._producer_loop, name=f"BlockingProducer-{type(self.original_brick).__name__}", daemon=True
+                target=self._producer_loop, name=f"BlockingProducer-{self._brick_name}", daemon=True
             )
             self._producer_thread.start()
-            logger.debug(f"Started internal producer thread for {type(self.original_brick).__name__}")
+            logger.debug("Started internal producer thread for %s", self._brick_name)
 
     async def stop(self):
         """Signal the producer thread and the original brick to stop."""
@@ -125,47 +204,42 @@ class AsyncBlockingSourceAdapter(AsyncBrickAdapter):
         await super().stop()
 
     def unblock_producer(self):
-        """Signals the producer thread and injects sentinel to unblock consumer."""
+        """Signals the producer thread to stop and closes the stream, unblocking the consumer."""
         if not self._stop_event.is_set() and self._producer_thread and self._producer_thread.is_alive():
-            logger.debug(f"Adapter for {type(self.original_brick).__name__}: signaling stop event and injecting sentinel.")
-            # Allow the producer thread to stop cleanly on its next iteration
+            logger.debug("Adapter for %s: signaling stop event and closing the stream.", self._brick_name)
+            # Allow the producer thread to stop cleanly on its next iteration, even if it's waiting for consumption
             self._stop_event.set()
+            self._consumed.set()
 
-            # Put sentinel to unblock the _data_queue.get() call in produce()
-            try:
-                self._data_queue.put_nowait(_SHUTDOWN)
-            except queue.Full:
-                logger.warning(f"Adapter for {type(self.original_brick).__name__}: could not inject sentinel, queue full.")
-            except Exception as e:
-                logger.warning(f"Adapter for {type(self.original_brick).__name__}: error injecting sentinel: {e}")
+            # Wake up the wait in produce(), any item still pending is dropped
+            self._closed = True
+            self._item_ready.set()
         else:
-            logger.debug(f"Adapter for {type(self.original_brick).__name__}: stop already signaled.")
+            logger.debug("Adapter for %s: stop already signaled.", self._brick_name)
 
     async def produce(self, *args: Any) -> Any:
         """Normalized async produce, gets data from internal queue populated by the daemon thread
-        and applies emission rate limit.
+        and applies emission rate limit. Returns None once the stream is closed, or if it was never started.
         """
-        if not self._loop:
-            raise RuntimeError("Loop not set for adapter execution")
-        if self._stop_event.is_set() or not self._producer_thread or not self._producer_thread.is_alive():
-            logger.debug(f"Producer thread for {type(self.original_brick).__name__} not running in produce().")
-            # Might happen if start wasn't called or thread died. Return None to signal end.
+        if self._closed:
             return None
 
         # Rate limiting is applied at emission time, before getting the actual data to emit
         if self._limiter:
-            await self._limiter.wait()
-
-        data = await self._loop.run_in_executor(None, self._data_queue.get)
-        if data is _SHUTDOWN:
-            logger.debug(f"Adapter {type(self.original_brick).__name__} received sentinel from internal queue.")
+            delay = self._limiter.try_acquire()
+            if delay:
+                await asyncio.sleep(delay)
+
+        await self._item_ready.wait()
+        self._item_ready.clear()
+        if self._closed:
+            logger.debug("Adapter %s: stream closed.", self._brick_name)
             return None
-        self._data_queue.task_done()
+        data = self._data_deque.popleft()
+        self._consumed.set()
 
         return data
 
-    # TODO: we can probably avoid propagating the _SHUTDOWN sentinel and simply return.
-    # self._producer_thread.is_alive() in produce() should take care of this situation.
     def _producer_loop(self):
         """Target for the internal daemon thread. Transfers data from the blocking produce method to the async one."""
         try:
@@ -173,77 +247,135 @@ class AsyncBlockingSourceAdapter(AsyncBrickAdapter):
                 try:
                     data = self._produce_method()
                     if data is None:
-                        logger.debug(f"Internal producer thread ({type(self.original_brick).__name__}): produce returned None. Stopping.")
-                        self._data_queue.put(_SHUTDOWN)
+                        logger.debug("Internal producer thread (%s): produce returned None. Stopping.", self._brick_name)
                         break
-                    if not self._stop_event.is_set():
-                        self._data_queue.put(data)
-                    else:
+                    # Wait for the previous item to be consumed before handing over this one
+                    self._consumed.wait()
+                    if self._stop_event.is_set():
                         break
+                    self._consumed.clear()
+                    self._data_deque.append(data)
+                    self._wake_up_consumer()
                 except Exception as e:
-                    logger.exception(f"Error in internal producer thread ({type(self.original_brick).__name__}): {e}")
-                    self._data_queue.put(_SHUTDOWN)  # Signal error
+                    logger.exception(f"Error in internal producer thread ({self._brick_name}): {e}")
                     break
         finally:
-            logger.debug(f"Internal producer thread finished for {type(self.original_brick).__name__}.")
-            try:
-                self._data_queue.put_nowait(_SHUTDOWN)  # Ensure sentinel
-            except queue.Full:
-                pass
-            except Exception as e:
-                logger.warning(f"Exception putting final sentinel from producer thread: {e}")
+            logger.debug("Internal producer thread finished for %s.", self._brick_name)
+            if not self._stop_event.is_set():
+                # Signal end of stream or error once the last item has been consumed, unless the consumer side already
+                # closed the stream
+                self._consumed.wait()
+                self._closed = True
+                self._wake_up_consumer()
+
+    def _wake_up_consumer(self):
+        """Called from the producer thread, wakes up produce() on the event loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._item_ready.set)
+        except RuntimeError:
+            pass  # Event loop already closed, nobody is waiting for data anymore
 
 
 class AsyncProcessorAdapter(AsyncBrickAdapter):
-    def __init__(self, original_brick: Any, rate_limit: Optional[int] = None):
+    """Adapter for processors.
+
+    Sync process methods run in the executor, unless blocking is False: in that case they are called directly on the
+    event loop thread. Only set blocking=False if the method never does I/O and always returns quickly, otherwise the
+    whole pipeline stalls while it runs.
+
+    If the brick also provides a process_batch method taking a list of items, up to batch_size items already waiting
+    in the input queue are handed to it in a single call. Otherwise batch_size is ignored.
+    """
+
+    def __init__(self, original_brick: Any, rate_limit: Optional[int] = None, blocking: bool = True, batch_size: int = 1):
         super().__init__(original_brick, rate_limit)
 
         self._process_method = getattr(self.original_brick, "process", None)
         if not callable(self._process_method):
-            raise TypeError(f"Method 'process' not found on {type(self.original_brick).__name__}")
+            raise TypeError(f"Method 'process' not found on {self._brick_name}")
 
-        self._is_sync = not asyncio.iscoroutinefunction(self._process_method)
+        self._is_sync = not _is_coro(self._process_method)
+        self._blocking = blocking
         self._limiter = AsyncRateLimiter(rate_limit) if rate_limit else None
-
-    async def process(self, *args: Any) -> Any:
-        if not self._loop and self._is_sync:
-            raise RuntimeError("Loop not set for executing sync process")
-
+        # Sync non-blocking methods are called inline, the others awaited or run in the executor
+        self.process = self._specialize(self._process_method, inline=self._is_sync and not blocking)
+
+        self._process_batch_method = getattr(self.original_brick, "process_batch", None)
+        if not callable(self._process_batch_method):
+            self._process_batch_method = None
+        self._batch_call_inline = False
+        self._process_batch_call = None
+        if self._process_batch_method is not None:
+            self._batch_call_inline = not blocking and not _is_coro(self._process_batch_method)
+            self._process_batch_call = self._make_caller(self._process_batch_method)
+        self.batch_size = max(1, batch_size) if self._process_batch_method else 1
+
+    async def process_batch(self, items: list) -> list:
+        """Process several items with a single call of the brick's process_batch method. Returns the list of results."""
         if self._limiter:
-            await self._limiter.wait()
+            delay = self._limiter.try_acquire(len(items))
+            if delay:
+                await asyncio.sleep(delay)
 
-        if self._is_sync:
-            return await self._loop.run_in_executor(None, self._process_method, *args)
-        else:
-            return await self._process_method(*args)
+        if self._batch_call_inline:
+            return self._process_batch_method(items)
+        return await self._process_batch_call(items)
 
 
 class AsyncSinkAdapter(AsyncBrickAdapter):
-    def __init__(self, original_brick: Any, rate_limit: Optional[int] = None):
+    """Adapter for sinks.
+
+    Sync consume methods run in the executor, unless blocking is False: in that case they are called directly on the
+    event loop thread. Only set blocking=False if the method never does I/O and always returns quickly, otherwise the
+    whole pipeline stalls while it runs.
+
+    If the brick also provides a consume_batch method taking a list of items, up to batch_size items already waiting
+    in the input queue are handed to it in a single call. Otherwise batch_size is ignored.
+    """
+
+    def __init__(self, original_brick: Any, rate_limit: Optional[int] = None, blocking: bool = True, batch_size: int = 1):
         super().__init__(original_brick, rate_limit)
 
         self._consume_method = getattr(self.original_brick, "consume", None)
         if not callable(self._consume_method):
-            raise TypeError(f"Method 'consume' not found on {type(self.original_brick).__name__}")
+            raise TypeError(f"Method 'consume' not found on {self._brick_name}")
 
-        self._is_sync = not asyncio.iscoroutinefunction(self._consume_method)
+        self._is_sync = not _is_coro(self._consume_method)
+        self._blocking = blocking
         self._limiter = AsyncRateLimiter(rate_limit) if rate_limit else None
-
-    async def consume(self, *args: Any) -> Any:
-        if not self._loop and self._is_sync:
-            raise RuntimeError("Loop not set for executing sync consume")
-
+        # Sync non-blocking methods are called inline, the others awaited or run in the executor
+        self.consume = self._specialize(self._consume_method, inline=self._is_sync and not blocking)
+
+        self._consume_batch_method = getattr(self.original_brick, "consume_batch", None)
+        if not callable(self._consume_batch_method):
+            self._consume_batch_method = None
+        self._batch_call_inline = False
+        self._consume_batch_call = None
+        if self._consume_batch_method is not None:
+            self._batch_call_inline = not blocking and not _is_coro(self._consume_batch_method)
+            self._consume_batch_call = self._make_caller(self._consume_batch_method)
+        self.batch_size = max(1, batch_size) if self._consume_batch_method else 1
+
+    async def consume_batch(self, items: list) -> Any:
+        """Consume several items with a single call of the brick's consume_batch method."""
         if self._limiter:
-            await self._limiter.wait()
+            delay = self._limiter.try_acquire(len(items))
+            if delay:
+                await asyncio.sleep(delay)
+
+        if self._batch_call_inline:
+            return self._consume_batch_method(items)
+        return await self._consume_batch_call(items)
 
-        if self._is_sync:
-            return await self._loop.run_in_executor(None, self._consume_method, *args)
-        else:
-            return await self._consume_method(*args)
 
+def create_adapter(
+    brick: Any, brick_type: str, rate_limit: Optional[int] = None, blocking: bool = True, batch_size: int = 1
+) -> AsyncBrickAdapter:
+    """Factory function that creates the appropriate adapter for the provided brick_type.
 
-def create_adapter(brick: Any, brick_type: str, rate_limit: Optional[int] = None) -> AsyncBrickAdapter:
-    """Factory function that creates the appropriate adapter for the provided brick_type."""
+    The blocking and batch_size arguments only apply to processors and sinks, see AsyncProcessorAdapter and
+    AsyncSinkAdapter.
+    """
     original_brick = brick
     method_name = ""
     SyncAdapterClass = None
@@ -283,10 +415,12 @@ def create_adapter(brick: Any, brick_type: str, rate_limit: Optional[int] = None
         raise TypeError(f"{brick_type.capitalize()} brick must have a callable '{method_name}' method.")
 
     # Decide which adapter to use based on sync/async nature
-    is_sync = not asyncio.iscoroutinefunction(core_method)
+    is_sync = not _is_coro(core_method)
     AdapterClass = SyncAdapterClass if is_sync else AsyncAdapterClass
 
     try:
-        return AdapterClass(original_brick, rate_limit)
+        if brick_type == "source":
+            return AdapterClass(original_brick, rate_limit)
+        return AdapterClass(original_brick, rate_limit, blocking=blocking, batch_size=batch_size)
     except TypeError as e:
         raise TypeError(f"{brick_type.capitalize()} brick error: {e}") from e
@@ -5,8 +5,5 @@
 from typing import TypeVar
 
 
-# Sentinel value that triggers shutdown logic
-_SHUTDOWN = object()
-
 T_IN = TypeVar("T_IN")
 T_OUT = TypeVar("T_OUT")
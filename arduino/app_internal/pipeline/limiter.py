@@ -7,21 +7,50 @@ import time
 
 
 class AsyncRateLimiter:
-    """Helper class for async rate limiting."""
+    """Helper class for async rate limiting, implemented as a token bucket.
 
-    def __init__(self, calls_per_second: int):
+    Tokens are refilled lazily at calls_per_second and up to capacity tokens can be accumulated, allowing bursts of
+    that size. The default capacity of 1 enforces a strict minimum interval between calls.
+
+    No lock is needed: each limiter belongs to a single adapter, which is driven by a single pipeline task.
+    """
+
+    def __init__(self, calls_per_second: int, capacity: int = 1):
         if calls_per_second <= 0:
             raise ValueError("calls_per_second must be greater than 0")
-        self._min_interval = 1.0 / calls_per_second
-        self._lock = asyncio.Lock()
-        self._last_call_time = 0.0
-
-    async def wait(self):
-        """Wait if necessary to maintain the desired rate."""
-        async with self._lock:
-            current_time = time.monotonic()
-            elapsed = current_time - self._last_call_time
-            wait_time = self._min_interval - elapsed
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            self._last_call_time = time.monotonic()
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._rate = float(calls_per_second)
+        self._capacity = float(capacity)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+
+    def try_acquire(self, calls: int = 1) -> float:
+        """Take the tokens for the given number of calls without waiting.
+
+        The tokens are reserved in any case: if the bucket doesn't hold enough of them it goes into debt, which the
+        following refills pay back.
+
+        Args:
+            calls (int): The number of calls to account for, e.g. the size of a batch processed at once.
+
+        Returns:
+            float: 0 if the calls can proceed right away, otherwise the number of seconds to wait before proceeding.
+        """
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+        self._tokens -= calls
+        if self._tokens >= 0.0:
+            return 0.0
+        return -self._tokens / self._rate
+
+    async def wait(self, calls: int = 1):
+        """Wait if necessary to maintain the desired rate.
+
+        Args:
+            calls (int): The number of calls to account for, e.g. the size of a batch processed at once.
+        """
+        delay = self.try_acquire(calls)
+        if delay:
+            await asyncio.sleep(delay)
@@ -4,25 +4,61 @@
 
 import asyncio
 import logging
+import os
+import sys
 import threading
-from concurrent.futures import Future, CancelledError as FutureCancelledError
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError as FutureCancelledError
 from typing import Any, Optional
 from .adapter import create_adapter
+from .spsc import SPSCAsyncQueue
 from .task import PipelineTask, SourceTask, ProcessorTask, SinkTask
 from arduino.app_utils import Logger
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional, fall back to the standard asyncio event loop
+    uvloop = None
+
 logger = Logger("pipeline.main")
 
 
+def _gil_disabled() -> bool:
+    """Whether the interpreter is a free-threaded build running without the GIL (Python 3.13+)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
 class Pipeline:
-    def __init__(self, debug: bool = False):
+    """Chain of bricks (a source, optional processors, a sink) run on a dedicated asyncio event loop.
+
+    Steps are linked by bounded queues sized by the queue_size argument of add_source/add_processor. The default of 1
+    keeps at most one item in flight between two steps: a slow step holds back the upstream ones (backpressure)
+    instead of letting stale items pile up, so the end-to-end latency stays bounded to about one item per step, e.g.
+    one audio period from a microphone. Larger sizes absorb bursts at the cost of that latency, and should only be
+    used on purpose. stats() reports how full the queues are.
+
+    The event loop is a uvloop one if uvloop is installed, a standard asyncio one otherwise.
+    """
+
+    def __init__(self, debug: bool = False, blocking_pool_size: Optional[int] = None):
+        """Initialize the pipeline.
+
+        Args:
+            debug (bool): Enable debug logging.
+            blocking_pool_size (int, optional): Number of threads running the sync bricks' methods. If None, it is
+                sized from the number of blocking bricks.
+        """
         if debug:
             logger.setLevel(logging.DEBUG)
+        self._blocking_pool_size = blocking_pool_size
+        self._blocking_pool: Optional[ThreadPoolExecutor] = None
         self._steps: list[PipelineTask] = []
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._loop_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._pipeline_future: Optional[Future] = None  # Represents the overall pipeline task
+        self._stop_task: Optional[asyncio.Task] = None
+        self._owned_tasks: set[asyncio.Task] = set()  # Tasks created by the pipeline on its loop, pending ones only
         self._running = False
 
     def add_source(self, brick: Any, rate_limit: Optional[int] = None, queue_size: int = 1):
@@ -36,12 +72,12 @@ class Pipeline:
         except TypeError:
             raise
 
-        self._steps.append(SourceTask(adapter))
-        logger.debug(f"Added Source task for: {type(adapter.original_brick).__name__}")
+        self._steps.append(SourceTask(adapter, queue_size))
+        logger.debug(f"Added Source task for: {adapter._brick_name}")
 
         return self
 
-    def add_processor(self, brick: Any, rate_limit: Optional[int] = None, queue_size: int = 1):
+    def add_processor(self, brick: Any, rate_limit: Optional[int] = None, queue_size: int = 1, blocking: bool = True, batch_size: int = 1):
         if self._running:
             raise RuntimeError("Cannot add bricks while pipeline is running.")
         if not self._steps:
@@ -50,16 +86,17 @@ class Pipeline:
             raise ValueError("Cannot add processor after a sink.")
 
         try:
-            adapter = create_adapter(brick, "processor", rate_limit)
+            adapter = create_adapter(brick, "processor", rate_limit, blocking, batch_size)
         except TypeError:
             raise
 
-        self._steps.append(ProcessorTask(adapter))
-        logger.debug(f"Added Processor task for: {type(adapter.original_brick).__name__}")
+        self._ensure_batch_capacity(adapter.batch_size)
+        self._steps.append(ProcessorTask(adapter, queue_size))
+        logger.debug(f"Added Processor task for: {adapter._brick_name}")
 
         return self
 
-    def add_sink(self, brick: Any, rate_limit: Optional[int] = None, queue_size: int = 1):
+    def add_sink(self, brick: Any, rate_limit: Optional[int] = None, queue_size: int = 1, blocking: bool = True, batch_size: int = 1):
         if self._running:
             raise RuntimeError("Cannot add bricks while pipeline is running.")
         if not self._steps:
@@ -68,15 +105,36 @@ class Pipeline:
             raise ValueError("Cannot add sink after another sink.")
 
         try:
-            adapter = create_adapter(brick, "sink", rate_limit)
+            adapter = create_adapter(brick, "sink", rate_limit, blocking, batch_size)
         except TypeError:
             raise
 
-        self._steps.append(SinkTask(adapter))
-        logger.debug(f"Added Sink task for: {type(adapter.original_brick).__name__}")
+        self._ensure_batch_capacity(adapter.batch_size)
+        self._steps.append(SinkTask(adapter, queue_size))
+        logger.debug(f"Added Sink task for: {adapter._brick_name}")
 
         return self
 
+    def stats(self) -> list[dict[str, Any]]:
+        """Report the queue depth in front of each processor and sink.
+
+        Returns:
+            list[dict[str, Any]]: One entry per step after the source, with the brick name, the number of items
+                waiting in its input queue and the size of that queue. A queue that stays full points at a step
+                that can't keep up with the upstream ones.
+        """
+        return [
+            {"brick": step.adapter._brick_name, "queued": step.input_queue.qsize(), "queue_size": step.input_queue.maxsize}
+            for step in self._steps
+            if getattr(step, "input_queue", None) is not None
+        ]
+
+    def _ensure_batch_capacity(self, batch_size: int):
+        """Grow the output queue of the last step so that a full batch can wait in it."""
+        prev_step = self._steps[-1]
+        if batch_size > 1 and 0 < prev_step.output_queue.maxsize < batch_size:
+            prev_step.output_queue = SPSCAsyncQueue(batch_size)
+
     def start(self):
         """Starts the pipeline in a background thread."""
         if self._running:
@@ -120,60 +178,68 @@ class Pipeline:
 
         logger.debug("Stopping pipeline...")
 
-        # Schedule the async stop logic in the event loop thread
-        future = asyncio.run_coroutine_threadsafe(self._async_stop_pipeline(), self._loop)
+        # Schedule the async stop logic in the event loop thread, and wait for it without a concurrent.futures bridge
+        stop_done = threading.Event()
         try:
-            # Wait for the async stop sequence to complete (with timeout)
-            future.result(timeout=70.0)  # Should be > shutdown timeout inside _async_stop_pipeline
+            self._loop.call_soon_threadsafe(self._schedule_stop, stop_done)
+        except RuntimeError:
+            logger.debug("Pipeline event loop already closed, nothing to stop.")
+            stop_done.set()
+
+        # Should be > shutdown timeout inside _async_stop_pipeline
+        if stop_done.wait(timeout=70.0):
             logger.debug("Async stop sequence completed.")
-        except TimeoutError:
-            logger.exception("Timeout waiting for pipeline stop sequence to complete.")
+        else:
+            logger.error("Timeout waiting for pipeline stop sequence to complete.")
             # If timeout occurs, try to cancel remaining tasks forcefully
-            if not future.done():
-                future.cancel()
-            if self._pipeline_future and not self._pipeline_future.done():
-                self._loop.call_soon_threadsafe(self._pipeline_future.cancel)
-        except Exception as e:
-            logger.exception(f"Error during pipeline stop sequence: {e}")
-            # May need forceful cleanup here too
-
-        # Signal the event loop to stop running
-        if self._loop and self._loop.is_running():
-            self._loop.call_soon_threadsafe(self._loop.stop)
+            try:
+                self._loop.call_soon_threadsafe(self._cancel_pending_stop)
+            except RuntimeError:
+                pass  # Event loop already closed
 
-        # Wait for the event loop thread to terminate
+        # The event loop thread exits by itself once _async_run_pipeline has stopped all the steps. Stopping the loop
+        # right away would interrupt that cleanup, so only force it if the thread doesn't terminate in time.
         self._loop_thread.join(timeout=10.0)
         if self._loop_thread.is_alive():
             logger.warning("Pipeline event loop thread did not terminate cleanly.")
+            try:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            except (RuntimeError, AttributeError):
+                pass  # Event loop already closed
+            self._loop_thread.join(timeout=5.0)
 
         self._running = False
         self._loop = None
         self._loop_thread = None
         self._pipeline_future = None
+        self._stop_task = None
         logger.debug("Pipeline stopped.")
 
     def _run_loop(self, loop_ready_event: threading.Event):
         """Main loop."""
         try:
-            self._loop = asyncio.new_event_loop()
+            # uvloop, when installed, has noticeably cheaper task wakeups and queue handoffs between the steps
+            self._loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
             asyncio.set_event_loop(self._loop)
+            # Run the sync bricks on a dedicated pool, isolated from other users of the default executor
+            self._blocking_pool = self._create_blocking_pool()
+            self._loop.set_default_executor(self._blocking_pool)
             logger.debug("Internal event loop started.")
             loop_ready_event.set()
             # Run the main async pipeline logic, this will block until the pipeline is stopped or finished
-            self._loop.run_until_complete(self._async_run_pipeline())
+            self._loop.run_until_complete(self._track(self._loop.create_task(self._async_run_pipeline())))
         except Exception as e:
             logger.exception(f"Exception in pipeline event loop: {e}")
             raise
         finally:
             try:
                 logger.debug("Closing internal event loop...")
-                # Ensure all pending tasks are cancelled/finished before stopping loop
-                tasks = asyncio.all_tasks(self._loop)
+                # Ensure the pipeline's pending tasks are cancelled/finished before stopping loop
+                tasks = list(self._owned_tasks)
                 if tasks:
                     logger.debug(f"Waiting for {len(tasks)} remaining tasks before stopping loop...")
                     for task in tasks:
-                        if not task.done():
-                            task.cancel()
+                        task.cancel()
                     self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
 
                 self._loop.run_until_complete(self._loop.shutdown_asyncgens())
@@ -181,8 +247,26 @@ class Pipeline:
                 logger.debug("Internal event loop stopped.")
             except Exception as e:
                 logger.exception(f"Error during event loop cleanup: {e}")
+            if self._blocking_pool is not None:
+                self._blocking_pool.shutdown(wait=False, cancel_futures=True)
+            self._blocking_pool = None
             self._loop = None
 
+    def _create_blocking_pool(self) -> ThreadPoolExecutor:
+        """Create the executor for the sync bricks, with two threads per blocking brick and at least four.
+
+        On free-threaded Python builds the sync bricks running in this pool execute truly in parallel, so the pool
+        is given at least one thread per CPU core to let compute-bound bricks use all of them.
+        """
+        pool_size = self._blocking_pool_size
+        if not pool_size:
+            blocking_steps = [s for s in self._steps if getattr(s.adapter, "_is_sync", False) and getattr(s.adapter, "_blocking", False)]
+            pool_size = max(4, len(blocking_steps) * 2)
+            if _gil_disabled():
+                pool_size = max(pool_size, os.cpu_count() or 1)
+        logger.debug(f"Creating blocking pool with {pool_size} threads.")
+        return ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="pipeline-blocking")
+
     async def _async_run_pipeline(self):
         """The main async logic using Adapters."""
         if not self._loop:
@@ -190,18 +274,17 @@ class Pipeline:
         if len(self._steps) < 2:
             raise ValueError("Pipeline must have at least a source and a sink.")
 
-        # Set the loop for all steps (which passes it to adapters)
-        for step in self._steps:
-            step.set_loop(self._loop)
-
         # Link steps
         logger.debug("Linking pipeline step queues...")
         for i in range(len(self._steps) - 1):
             prev_step = self._steps[i]
             next_step = self._steps[i + 1]
             prev_output_queue = getattr(prev_step, "output_queue", None)
-            if prev_output_queue and hasattr(next_step, "input_queue"):
-                next_step.input_queue = prev_output_queue
+            if prev_output_queue is not None and hasattr(next_step, "input_queue"):
+                # Fresh queue for every run: its events bind to the loop that first waits on them, and each run has
+                # its own loop
+                prev_step.output_queue = SPSCAsyncQueue(prev_output_queue.maxsize)
+                next_step.input_queue = prev_step.output_queue
                 logger.debug(f"Linked output queue of step {i} to input queue of step {i + 1}")
             else:
                 err_msg = f"Cannot link step {i} ({type(prev_step)}) to step {i + 1} ({type(next_step)}): incompatible queue attributes."
@@ -210,8 +293,10 @@ class Pipeline:
 
         try:
             logger.debug("Starting steps...")
-            # Start steps
-            steps = [await step.start() for step in self._steps]
+            # Start steps concurrently, so that sync start methods run in parallel on the executor
+            steps = await asyncio.gather(*(step.start() for step in self._steps))
+            for task in steps:
+                self._track(task)
             logger.debug(f"Launched {len(steps)} steps.")
 
             # Gather and await them
@@ -224,14 +309,33 @@ class Pipeline:
             logger.exception(f"Pipeline async run failed: {e}")
         finally:
             logger.debug("Entering final cleanup phase for all steps...")
-            # Ensure resources are cleaned up
-            for step in self._steps:
-                try:
-                    await step.stop()
-                except Exception as e:
-                    logger.exception(f"Error while stopping {type(step.adapter.original_brick).__name__}: {e}")
+            # Ensure resources are cleaned up. Steps are stopped concurrently: each one first waits for its own task,
+            # which only ends after the upstream steps have ended, so sinks still get to drain their input.
+            results = await asyncio.gather(*(step.stop() for step in self._steps), return_exceptions=True)
+            for step, result in zip(self._steps, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error while stopping {step.adapter._brick_name}: {result}", exc_info=result)
             logger.debug("Final cleanup phase completed.")
 
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        """Register a task as owned by the pipeline, to be cancelled at loop shutdown if still pending."""
+        if not task.done():
+            self._owned_tasks.add(task)
+            task.add_done_callback(self._owned_tasks.discard)
+        return task
+
+    def _schedule_stop(self, stop_done: threading.Event):
+        """Runs on the event loop thread: starts the stop sequence and sets stop_done once it has completed."""
+        self._stop_task = self._track(self._loop.create_task(self._async_stop_pipeline()))
+        self._stop_task.add_done_callback(lambda _: stop_done.set())
+
+    def _cancel_pending_stop(self):
+        """Runs on the event loop thread: cancels a stop sequence and a pipeline that didn't finish in time."""
+        if self._stop_task and not self._stop_task.done():
+            self._stop_task.cancel()
+        if self._pipeline_future and not self._pipeline_future.done():
+            self._pipeline_future.cancel()
+
     async def _async_stop_pipeline(self):
         """Coroutine scheduled by stop() to ensure pipeline finishes.
         Unblocks source if needed and ensures the main gather future completes.
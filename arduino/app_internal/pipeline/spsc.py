@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: Copyright (C) ARDUINO SRL (http://www.arduino.cc)
+#
+# SPDX-License-Identifier: MPL-2.0
+
+import asyncio
+import sys
+from collections import deque
+from typing import Any
+
+
+class QueueClosed(Exception):
+    """Raised by SPSCAsyncQueue.get() once the queue is closed and all its items have been taken."""
+
+
+class SPSCAsyncQueue:
+    """Bounded queue linking two pipeline steps, with a single producer task and a single consumer task.
+
+    It provides the subset of the asyncio.Queue API used by the pipeline tasks (put, get, get_nowait, empty, qsize,
+    maxsize) on top of a deque and two events. Without multiple waiters and task_done/join bookkeeping, a handoff
+    costs considerably less than with asyncio.Queue. No lock is needed: both ends run on the same event loop.
+
+    A maxsize of 0 or less means unbounded, as with asyncio.Queue.
+
+    The producer ends the stream with close(): the consumer still gets the items already queued, then get() raises
+    QueueClosed. The consumer thus handles the end of the stream once, outside of its per-item loop.
+    """
+
+    def __init__(self, maxsize: int = 1):
+        self._maxsize = maxsize
+        # Bound checked by put(), with unbounded queues mapped to a limit that is never reached
+        self._limit = maxsize if maxsize > 0 else sys.maxsize
+        self._buf = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def qsize(self) -> int:
+        return len(self._buf)
+
+    def empty(self) -> bool:
+        return not self._buf
+
+    def full(self) -> bool:
+        return len(self._buf) >= self._limit
+
+    async def put(self, item: Any):
+        """Append an item, waiting for the consumer to make room if the queue is full."""
+        while len(self._buf) >= self._limit:
+            self._not_full.clear()
+            await self._not_full.wait()
+        self._buf.append(item)
+        self._not_empty.set()
+
+    def close(self):
+        """Signal the end of the stream, waking up the consumer if it's waiting."""
+        self._closed = True
+        self._not_empty.set()
+
+    async def get(self) -> Any:
+        """Remove and return the oldest item, waiting for the producer if the queue is empty.
+
+        Raises:
+            QueueClosed: If the queue is empty and closed.
+        """
+        while not self._buf:
+            if self._closed:
+                raise QueueClosed
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = self._buf.popleft()
+        self._not_full.set()
+        return item
+
+    def get_nowait(self) -> Any:
+        """Remove and return the oldest item.
+
+        Raises:
+            asyncio.QueueEmpty: If the queue is empty.
+        """
+        if not self._buf:
+            raise asyncio.QueueEmpty
+        item = self._buf.popleft()
+        self._not_full.set()
+        return item
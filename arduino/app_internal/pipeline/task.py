@@ -3,10 +3,12 @@
 # SPDX-License-Identifier: MPL-2.0
 
 import asyncio
+import logging
 from typing import Generic, Optional
 from concurrent.futures import CancelledError as FutureCancelledError
-from .constants import _SHUTDOWN, T_IN, T_OUT
+from .constants import T_IN, T_OUT
 from .adapter import AsyncBrickAdapter, AsyncProcessorAdapter, AsyncSinkAdapter
+from .spsc import QueueClosed, SPSCAsyncQueue
 from arduino.app_utils import Logger
 
 logger = Logger("pipeline.task")
@@ -21,39 +23,39 @@ class PipelineTask:
 
     def __init__(self, adapter: AsyncBrickAdapter):
         self.adapter = adapter
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._task: Optional[asyncio.Task] = None
 
-    def set_loop(self, loop: asyncio.AbstractEventLoop):
-        self._loop = loop
-        self.adapter.set_loop(loop)
-
     async def start(self) -> asyncio.Task:
-        if not self._loop:
-            raise RuntimeError("Event loop not set")
-
-        log.debug(f"Starting user brick via adapter {type(self.adapter.original_brick).__name__}")
+        logger.debug(f"Starting user brick via adapter {self.adapter._brick_name}")
         await self.adapter.start()
 
         if self._task is None or self._task.done():
-            brick_name = type(self.adapter.original_brick).__name__
+            brick_name = self.adapter._brick_name
             task_name = type(self).__name__
-            self._task = self._loop.create_task(self._run(), name=f"{task_name}-{brick_name}")
-            log.debug(f"Created task for {brick_name}")
+            self._task = asyncio.create_task(self._run(), name=f"{task_name}-{brick_name}")
+            logger.debug(f"Created task for {brick_name}")
 
         return self._task
 
     async def stop(self):
         """Stops the task gracefully ."""
-        if self._task and not self._task.done():
+        task = self._task
+        if task and task.done():
+            # Already finished (e.g. upstream ended the stream): read the outcome without awaiting the task again
+            if task.cancelled():
+                logger.warning(f"Task {task.get_name()} cancelled during graceful stop.")
+            elif task.exception() is not None:
+                e = task.exception()
+                logger.error(f"Task {task.get_name()} raised exception during stop wait: {e}", exc_info=e)
+        elif task:
             try:
-                await self._task
+                await task
             except (asyncio.CancelledError, FutureCancelledError):
-                log.warning(f"Task {self._task.get_name()} cancelled during graceful stop.")
+                logger.warning(f"Task {task.get_name()} cancelled during graceful stop.")
             except Exception as e:
-                log.exception(f"Task {self._task.get_name()} raised exception during stop wait: {e}")
+                logger.exception(f"Task {task.get_name()} raised exception during stop wait: {e}")
 
-        log.debug(f"Stopping user brick via adapter {type(self.adapter.original_brick).__name__}")
+        logger.debug(f"Stopping user brick via adapter {self.adapter._brick_name}")
         await self.adapter.stop()
 
     async def _run(self):
@@ -64,112 +66,175 @@ class SourceTask(PipelineTask, Generic[T_OUT]):
     def __init__(self, adapter: AsyncBrickAdapter, queue_size: int = 1):
         super().__init__(adapter)
         self.adapter: AsyncBrickAdapter = adapter
-        self.output_queue = asyncio.Queue(queue_size)
+        self.output_queue = SPSCAsyncQueue(queue_size)
 
     async def _run(self):
-        brick_name = type(self.adapter.original_brick).__name__
-        log.info(f"Source task run loop started for {brick_name}.")
-        if not self._loop:
-            raise RuntimeError("Loop not set")
+        brick_name = self.adapter._brick_name
+        logger.info(f"Source task run loop started for {brick_name}.")
 
+        # Bound once, the loop runs for every item
+        produce = self.adapter.produce
+        put = self.output_queue.put
         try:
             while True:
                 try:
                     # Handles rate limit, sync/async and blocking variant internally
-                    data = await self.adapter.produce()
+                    data = await produce()
                     if data is None:
-                        log.info(f"Source adapter {brick_name} indicated end of stream.")
+                        logger.info(f"Source adapter {brick_name} indicated end of stream.")
                         break
-                    await self.output_queue.put(data)
+                    await put(data)
                 except AttributeError:
-                    log.exception(f"Adapter for {brick_name} missing produce?")
+                    logger.exception(f"Adapter for {brick_name} missing produce?")
                     break
                 except (asyncio.CancelledError, FutureCancelledError):
-                    log.info(f"Source task task {brick_name} cancelled.")
+                    logger.info(f"Source task task {brick_name} cancelled.")
                     raise
                 except Exception as e:
-                    log.exception(f"Error in source task {brick_name}: {e}")
+                    logger.exception(f"Error in source task {brick_name}: {e}")
                     break
         finally:
-            log.info(f"Source task {brick_name} finished. Signaling downstream.")
-            await self.output_queue.put(_SHUTDOWN)
+            logger.info(f"Source task {brick_name} finished. Signaling downstream.")
+            self.output_queue.close()
 
 
 class ProcessorTask(PipelineTask, Generic[T_IN, T_OUT]):
     def __init__(self, adapter: AsyncProcessorAdapter, queue_size: int = 1):
         super().__init__(adapter)
         self.adapter: AsyncProcessorAdapter = adapter
-        self.input_queue: Optional[asyncio.Queue[T_IN]] = None
-        self.output_queue: asyncio.Queue[T_OUT] = asyncio.Queue(queue_size)
+        self.input_queue: Optional[SPSCAsyncQueue] = None
+        self.output_queue = SPSCAsyncQueue(queue_size)
 
     async def _run(self):
-        brick_name = type(self.adapter.original_brick).__name__
+        brick_name = self.adapter._brick_name
         if not self.input_queue:
-            log.error(f"Input queue not set for processor {brick_name}")
+            logger.error(f"Input queue not set for processor {brick_name}")
+            return
+        logger.info(f"Processor task run loop started for {brick_name}.")
+
+        if self.adapter.batch_size > 1:
+            await self._run_batched(brick_name)
             return
-        log.info(f"Processor task run loop started for {brick_name}.")
 
+        # Bound once, the loop runs for every item
+        input_queue = self.input_queue
+        process = self.adapter.process
+        put = self.output_queue.put
         try:
             while True:
-                data_in = await self.input_queue.get()
+                # Take a ready item without going through a coroutine, only wait (never poll) when the queue is empty
+                data_in = input_queue.get_nowait() if not input_queue.empty() else await input_queue.get()
                 try:
-                    if data_in is _SHUTDOWN:
-                        log.debug(f"Processor {brick_name} got sentinel.")
-                        break
                     # Handles rate limit and sync/async variations internally
-                    data_out = await self.adapter.process(data_in)
+                    data_out = await process(data_in)
                     if data_out is not None:
-                        await self.output_queue.put(data_out)
-                    else:
-                        log.debug(f"Processor {brick_name} filtered data.")
+                        await put(data_out)
+                    elif logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Processor {brick_name} filtered data.")
                 except AttributeError:
-                    log.exception(f"Adapter for {brick_name} missing process?")
+                    logger.exception(f"Adapter for {brick_name} missing process?")
+                    break
+                except (asyncio.CancelledError, FutureCancelledError):
+                    logger.info(f"Processor task {brick_name} cancelled.")
+                    raise
+                except Exception as e:
+                    logger.exception(f"Error processing in {brick_name}: {e}")
                     break
+        except QueueClosed:
+            logger.debug(f"Processor {brick_name} reached end of stream.")
+        finally:
+            logger.info(f"Processor task {brick_name} finished. Signaling downstream.")
+            self.output_queue.close()
+
+    async def _run_batched(self, brick_name: str):
+        try:
+            while True:
+                batch = await _get_batch(self.input_queue, self.adapter.batch_size)
+                try:
+                    # Handles rate limit and sync/async variations internally
+                    for data_out in await self.adapter.process_batch(batch):
+                        if data_out is not None:
+                            await self.output_queue.put(data_out)
                 except (asyncio.CancelledError, FutureCancelledError):
-                    log.info(f"Processor task {brick_name} cancelled.")
+                    logger.info(f"Processor task {brick_name} cancelled.")
                     raise
                 except Exception as e:
-                    log.exception(f"Error processing in {brick_name}: {e}")
+                    logger.exception(f"Error processing batch in {brick_name}: {e}")
                     break
-                finally:
-                    self.input_queue.task_done()
+        except QueueClosed:
+            logger.debug(f"Processor {brick_name} reached end of stream.")
         finally:
-            log.info(f"Processor task {brick_name} finished. Signaling downstream.")
-            await self.output_queue.put(_SHUTDOWN)
+            logger.info(f"Processor task {brick_name} finished. Signaling downstream.")
+            self.output_queue.close()
 
 
 class SinkTask(PipelineTask, Generic[T_IN]):
     def __init__(self, adapter: AsyncSinkAdapter, queue_size: int = 1):
         super().__init__(adapter)
         self.adapter: AsyncSinkAdapter = adapter
-        self.input_queue: Optional[asyncio.Queue[T_IN]] = None
+        self.input_queue: Optional[SPSCAsyncQueue] = None
 
     async def _run(self):
-        brick_name = type(self.adapter.original_brick).__name__
+        brick_name = self.adapter._brick_name
         if not self.input_queue:
-            log.error(f"Input queue not set for sink {brick_name}")
+            logger.error(f"Input queue not set for sink {brick_name}")
             return
-        log.info(f"Sink task run loop started for {brick_name}.")
+        logger.info(f"Sink task run loop started for {brick_name}.")
 
+        if self.adapter.batch_size > 1:
+            await self._run_batched(brick_name)
+            return
+
+        # Bound once, the loop runs for every item
+        input_queue = self.input_queue
+        consume = self.adapter.consume
         try:
             while True:
-                data_in = await self.input_queue.get()
+                # Take a ready item without going through a coroutine, only wait (never poll) when the queue is empty
+                data_in = input_queue.get_nowait() if not input_queue.empty() else await input_queue.get()
                 try:
-                    if data_in is _SHUTDOWN:
-                        log.debug(f"Sink {brick_name} got sentinel.")
-                        break
                     # Handles rate limit, sync/async internally
-                    await self.adapter.consume(data_in)
+                    await consume(data_in)
                 except AttributeError:
-                    log.exception(f"Adapter for {brick_name} missing consume?")
+                    logger.exception(f"Adapter for {brick_name} missing consume?")
                     break
                 except (asyncio.CancelledError, FutureCancelledError):
-                    log.info(f"Sink task {brick_name} cancelled.")
+                    logger.info(f"Sink task {brick_name} cancelled.")
                     raise
                 except Exception as e:
-                    log.exception(f"Error consuming in {brick_name}: {e}")
+                    logger.exception(f"Error consuming in {brick_name}: {e}")
                     break
-                finally:
-                    self.input_queue.task_done()
+        except QueueClosed:
+            logger.debug(f"Sink {brick_name} reached end of stream.")
         finally:
-            log.info(f"Sink task {brick_name} finished.")
+            logger.info(f"Sink task {brick_name} finished.")
+
+    async def _run_batched(self, brick_name: str):
+        try:
+            while True:
+                batch = await _get_batch(self.input_queue, self.adapter.batch_size)
+                try:
+                    # Handles rate limit, sync/async internally
+                    await self.adapter.consume_batch(batch)
+                except (asyncio.CancelledError, FutureCancelledError):
+                    logger.info(f"Sink task {brick_name} cancelled.")
+                    raise
+                except Exception as e:
+                    logger.exception(f"Error consuming batch in {brick_name}: {e}")
+                    break
+        except QueueClosed:
+            logger.debug(f"Sink {brick_name} reached end of stream.")
+        finally:
+            logger.info(f"Sink task {brick_name} finished.")
+
+
+async def _get_batch(queue: SPSCAsyncQueue, batch_size: int) -> list:
+    """Wait for one item, then take the items already queued, up to batch_size.
+
+    Raises:
+        QueueClosed: If the end of the stream was reached before any item.
+    """
+    batch = [await queue.get()]
+    while len(batch) < batch_size and not queue.empty():
+        batch.append(queue.get_nowait())
+    return batch
@@ -2,13 +2,15 @@
 #
 # SPDX-License-Identifier: MPL-2.0
 
+import asyncio
 import time
 import alsaaudio
 import numpy as np
 import threading
 import logging
-import re
+from collections import deque
 from arduino.app_utils import Logger
+from ._bufpool import AudioBufferPool
 
 logger = Logger("Microphone")
 
@@ -29,11 +31,18 @@ class Microphone:
     """Microphone class for capturing audio using ALSA PCM interface.
 
     Handles automatic reconnection on device disconnection.
+
+    The device must be released explicitly, with stop() or by using the microphone as a context manager: nothing is
+    done at garbage collection time, where blocking ALSA calls and logging aren't safe. An unreferenced PCM handle
+    is still closed by alsaaudio when it's collected.
     """
 
     USB_MIC_1 = "USB_MIC_1"
     USB_MIC_2 = "USB_MIC_2"
 
+    # (monotonic time, device list) of the last USB microphones enumeration, see _list_usb_microphones_cached()
+    _usb_microphones_cache: tuple[float, list] = (float("-inf"), [])
+
     # Mapping ALSA format string -> (PCM_FORMAT_*, numpy dtype)
     FORMAT_MAP = {
         "S8": ("PCM_FORMAT_S8", np.int8),
@@ -71,6 +80,8 @@ class Microphone:
         periodsize: int = 1024,
         max_reconnect_attempts: int = 30,
         reconnect_delay: float = 2.0,
+        batch_periods: int = 1,
+        nonblocking: bool = False,
     ):
         """Initialize the Microphone object.
 
@@ -82,10 +93,18 @@ class Microphone:
             periodsize (int): Period size in frames (default: 1024).
             max_reconnect_attempts (int): Maximum attempts to reconnect on disconnection (default: 30).
             reconnect_delay (float): Delay in seconds between reconnection attempts (default: 2.0).
+            batch_periods (int): Number of periods joined in each chunk yielded by stream() (default: 1). Larger values
+                let CPU-bound consumers process more audio per call, at the cost of batch_periods times the latency.
+            nonblocking (bool): Open the device in non-blocking mode, so that stream_async() waits for audio on the
+                event loop instead of in a reader thread (default: False). The blocking generators (stream(),
+                stream_into(), ...) can't be used in this mode.
 
         Raises:
             MicrophoneException: If the microphone cannot be initialized or if the device is busy.
+            ValueError: If batch_periods is less than 1.
         """
+        if batch_periods < 1:
+            raise ValueError("batch_periods must be at least 1.")
         logger.info(
             "Init Microphone with device=%s, sample_rate=%d, channels=%d, format=%s, periodsize=%d",
             device,
@@ -103,11 +122,21 @@ class Microphone:
         self._alsa_format, self._dtype = self.FORMAT_MAP[format]
         if self._dtype is None:
             raise NotImplementedError(f"Format {self.format} is not supported for numpy conversion.")
+        # Resolved once, as the PCM is set up again on every reconnection
+        self._alsa_format_const = getattr(alsaaudio, self._alsa_format, None)
+        if self._alsa_format_const is None:
+            raise MicrophoneException(f"Format {format} is not supported by this ALSA version.")
         self.periodsize = periodsize
+        self.batch_periods = batch_periods
+        self.nonblocking = nonblocking
+        # Normalized once, so that the per-period conversions don't have to resolve the dtype again
+        self._np_dtype = np.dtype(self._dtype)
+        self._bytes_per_period = periodsize * channels * self._np_dtype.itemsize
         self._pcm: alsaaudio.PCM = None
         self._pcm_lock = threading.Lock()
         self._native_rate = None
         self.is_recording = threading.Event()
+        self._stop_requested = threading.Event()  # Interrupts the reconnection waits
         self.max_reconnect_attempts = max_reconnect_attempts
         self.reconnect_delay = reconnect_delay
         self._mixer: alsaaudio.Mixer = self._load_mixer()
@@ -125,7 +154,7 @@ class Microphone:
         """
         logger.debug(f"Resolving device: {device}")
         if not device or device.startswith("USB_MIC_"):
-            usb_devices = self._list_usb_microphones()
+            usb_devices = self._list_usb_microphones_cached()
             if not usb_devices:
                 logger.error("No USB microphones found for USB_MIC_1/2 macro.")
                 raise MicrophoneException("No USB microphone found.")
@@ -133,10 +162,10 @@ class Microphone:
                 logger.debug(f"Using USB_MIC_1: {usb_devices[0]}")
                 return usb_devices[0]
 
-            # Detect device via regex
-            match = re.search(r"USB_MIC_(\d+)", device)
-            if match:
-                device_number = int(match.group(1))
+            # Detect device number from the macro suffix
+            suffix = device[len("USB_MIC_") :]
+            if suffix.isdigit():
+                device_number = int(suffix)
                 logger.debug(f"Detected USB_MIC_{device_number} from device string: {device}")
                 if device_number < 2 or device_number > len(usb_devices):
                     logger.error(f"Invalid USB_MIC_{device_number} requested, only {len(usb_devices)} USB microphones found.")
@@ -218,6 +247,26 @@ class Microphone:
             logger.error(f"Error setting volume: {e}")
             raise MicrophoneException(f"Error setting volume: {e}")
 
+    @staticmethod
+    def _list_usb_microphones_cached(ttl: float = 0.5) -> list:
+        """Like _list_usb_microphones(), but reuse the last enumeration if it is less than ttl seconds old.
+
+        The cache is shared by all the Microphone instances, so that opening several microphones or a burst of read
+        errors enumerates the ALSA cards only once.
+        """
+        now = time.monotonic()
+        enumerated_at, usb_devices = Microphone._usb_microphones_cache
+        if now - enumerated_at < ttl:
+            return usb_devices
+        usb_devices = Microphone._list_usb_microphones()
+        Microphone._usb_microphones_cache = (now, usb_devices)
+        return usb_devices
+
+    @staticmethod
+    def _clear_usb_microphones_cache():
+        """Forget the last enumeration, so that the next lookup sees newly plugged microphones."""
+        Microphone._usb_microphones_cache = (float("-inf"), [])
+
     @staticmethod
     def _list_usb_microphones() -> list:
         """Return an ordered list of ALSA device names for available USB microphones (plughw only)."""
@@ -242,19 +291,29 @@ class Microphone:
         logger.info(f"USB microphones found: {usb_devices}")
         return usb_devices
 
+    def _device_present(self, error: Exception) -> bool:
+        """Tell whether the microphone device is still connected, after a read failed with error.
+
+        A "No such device" error answers without enumerating the cards. Otherwise the cached list of USB microphones
+        is used, as ALSA errors tend to come in bursts.
+        """
+        if "No such device" in str(error):
+            return False
+        return self.device in self._list_usb_microphones_cached()
+
     def _open_pcm(self):
         """Open the ALSA PCM device and set parameters, with fallback and error handling."""
         logger.debug(f"Opening PCM device: {self.device}")
         try:
             self._pcm = alsaaudio.PCM(
                 type=alsaaudio.PCM_CAPTURE,
-                mode=alsaaudio.PCM_NORMAL,  # Hardcoded to blocking mode
+                mode=alsaaudio.PCM_NONBLOCK if self.nonblocking else alsaaudio.PCM_NORMAL,
                 device=self.device,
             )
             try:
                 self._pcm.setchannels(self.channels)
                 self._pcm.setrate(self.sample_rate)
-                self._pcm.setformat(getattr(alsaaudio, self._alsa_format))
+                self._pcm.setformat(self._alsa_format_const)
                 self._pcm.setperiodsize(self.periodsize)
                 self._native_rate = self.sample_rate
                 logger.debug(
@@ -271,12 +330,12 @@ class Microphone:
                     logger.debug(f"Trying fallback with plughw device: {plugdev}")
                     self._pcm = alsaaudio.PCM(
                         type=alsaaudio.PCM_CAPTURE,
-                        mode=alsaaudio.PCM_NORMAL,  # Hardcoded to blocking mode
+                        mode=alsaaudio.PCM_NONBLOCK if self.nonblocking else alsaaudio.PCM_NORMAL,
                         device=plugdev,
                     )
                     self._pcm.setchannels(self.channels)
                     self._pcm.setrate(self.sample_rate)
-                    self._pcm.setformat(getattr(alsaaudio, self._alsa_format))
+                    self._pcm.setformat(self._alsa_format_const)
                     self._pcm.setperiodsize(self.periodsize)
                     self.device = plugdev
                     self._native_rate = self.sample_rate
@@ -285,12 +344,12 @@ class Microphone:
                     logger.error(f"plughw fallback failed, using native device params for {self.device}")
                     self._pcm = alsaaudio.PCM(
                         type=alsaaudio.PCM_CAPTURE,
-                        mode=alsaaudio.PCM_NORMAL,  # Hardcoded to blocking mode
+                        mode=alsaaudio.PCM_NONBLOCK if self.nonblocking else alsaaudio.PCM_NORMAL,
                         device=self.device,
                     )
                     self._pcm.setchannels(self.channels)
                     self._native_rate = self._pcm.rate()
-                    self._pcm.setformat(getattr(alsaaudio, self._alsa_format))
+                    self._pcm.setformat(self._alsa_format_const)
                     self._pcm.setperiodsize(self.periodsize)
                     logger.debug("PCM opened with native params: %s, %dHz", self.device, self._native_rate)
         except alsaaudio.ALSAAudioError as e:
@@ -307,6 +366,7 @@ class Microphone:
         """Start the microphone stream by opening the PCM device."""
         if self.is_recording.is_set():
             raise RuntimeError("Microphone is already recording, cannot start again.")
+        self._stop_requested.clear()
         self.connect()
 
     def connect(self):
@@ -316,8 +376,13 @@ class Microphone:
             self.is_recording.set()
             logger.info("Microphone connected successfully.")
 
+    @property
+    def dtype(self) -> np.dtype:
+        """The numpy dtype of the audio samples produced by this microphone."""
+        return self._np_dtype
+
     def stream(self):
-        """Yield audio chunks from the microphone. Each chunk has periodsize samples.
+        """Yield audio chunks from the microphone. Each chunk has periodsize * batch_periods samples.
 
         - Handles automatic reconnection if the device is unplugged and replugged.
         - Only one main loop, no nested loops.
@@ -325,13 +390,294 @@ class Microphone:
         - When max reconnect attempts are reached, the generator returns (StopIteration for the caller).
         - All PCM operations are protected by lock.
 
+        Each chunk is a zero-copy view of the PCM data returned by ALSA, so it stays valid after the next iteration
+        and can be kept by the caller. To reuse a single preallocated buffer instead, see stream_into().
+
         Yields:
             np.ndarray: Audio data as a numpy array of the correct dtype, depending on the format specified.
         """
-        prev_time = None
-        debug_mode = logger.isEnabledFor(logging.DEBUG)
+        yield from self._stream()
+
+    def _stream(self, abandoned: threading.Event = None):
+        """Implementation of stream(), ended early when abandoned is set (see _read_pcm())."""
+        periods = self._read_periods(abandoned)
+        if self.batch_periods > 1:
+            periods = self._join_periods(periods)
+        for data in periods:
+            try:
+                arr = np.frombuffer(data, dtype=self._np_dtype)
+            except Exception as e:
+                logger.error(f"Error converting PCM data to numpy array: {e}")
+                continue
+            yield arr
+
+    def _join_periods(self, periods):
+        """Group the raw PCM data of batch_periods successive periods into a single bytes object.
+        An incomplete batch at the end of the stream is dropped.
+        """
+        batch = []
+        for data in periods:
+            batch.append(data)
+            if len(batch) == self.batch_periods:
+                yield b"".join(batch)
+                batch.clear()
+
+    def stream_pooled(self, pool: AudioBufferPool):
+        """Like stream(), but copy each audio chunk into a buffer taken from pool instead of allocating a new array.
+
+        Unlike stream_into(), the chunks can be kept across iterations (e.g. queued for another thread): the consumer
+        gives each one back with pool.release(chunk) once done with it.
+
+        Args:
+            pool (AudioBufferPool): Pool of buffers with the microphone dtype and periodsize * channels samples.
+
+        Yields:
+            np.ndarray: Audio data as a numpy array of the correct dtype, owned by the consumer until released.
+
+        Raises:
+            ValueError: If the pool buffers have the wrong dtype or size.
+        """
+        if pool.dtype != self.dtype:
+            raise ValueError(f"Pool buffers dtype must be {self.dtype}, not {pool.dtype}.")
+        if pool.nsamples != self.periodsize * self.channels:
+            raise ValueError(f"Pool buffers must hold {self.periodsize * self.channels} samples.")
+
+        itemsize = pool.dtype.itemsize
+        for data in self._read_periods():
+            buf = pool.acquire()
+            nbytes = len(data)
+            if nbytes > buf.nbytes:
+                logger.error(f"PCM data ({nbytes} bytes) does not fit the pool buffer ({buf.nbytes} bytes).")
+                pool.release(buf)
+                continue
+            memoryview(buf.view(np.uint8))[:nbytes] = data
+            n = nbytes // itemsize
+            yield buf if n == pool.nsamples else buf[:n]
+
+    def stream_float32(self):
+        """Yield audio chunks converted to float32 samples, normalized to [-1.0, 1.0) for integer formats.
+
+        The conversion runs in a single vectorized numpy pass into a reused buffer, so the content of each chunk is
+        only valid until the generator is resumed, as with stream_into().
+
+        Yields:
+            np.ndarray: Audio data as a float32 numpy array.
+
+        Raises:
+            MicrophoneException: If the format is unsigned, which has no float32 normalization here.
+        """
+        if self.dtype.kind == "f":
+            scale = np.float32(1.0)
+        elif self.dtype.kind == "i":
+            bits = 24 if self.format.startswith("S24") else self.dtype.itemsize * 8
+            scale = np.float32(1.0 / (1 << (bits - 1)))
+        else:
+            raise MicrophoneException(f"Format {self.format} can't be converted to float32.")
+
+        samples = np.empty(self.periodsize * self.channels, dtype=self.dtype)
+        converted = np.empty(samples.size, dtype=np.float32)
+        for n in self.stream_into(samples):
+            out = converted[:n]
+            np.multiply(samples[:n], scale, out=out, dtype=np.float32)
+            yield out
+
+    async def stream_async(self, maxsize: int = 2):
+        """Async version of stream(), to consume the microphone from an asyncio event loop.
+
+        The blocking PCM reads run in a dedicated daemon thread, which hands each chunk over to the event loop with a
+        single call_soon_threadsafe wakeup instead of an executor round trip per period. If the consumer falls
+        behind, the oldest chunks are dropped so that the latest audio is always delivered first. The thread runs
+        until the microphone is stopped or the consumer stops iterating: it then ends after the period being read, or
+        within 0.1 seconds while waiting for a disconnected device to come back.
+
+        If the microphone was created with nonblocking=True, no thread is used: the PCM poll descriptors are
+        registered with the event loop and each period is read as soon as it's available.
+
+        Args:
+            maxsize (int): Maximum number of chunks waiting for the consumer (default: 2). Unused in non-blocking
+                mode, where each period is read only when the consumer asks for it.
+
+        Yields:
+            np.ndarray: Audio data as a numpy array of the correct dtype, depending on the format specified.
+
+        Raises:
+            MicrophoneDisconnectedException: If the device is disconnected and max retries are exceeded.
+        """
+        if self.nonblocking:
+            async for arr in self._stream_nonblocking():
+                yield arr
+            return
+
+        loop = asyncio.get_running_loop()
+        chunks = deque(maxlen=maxsize)
+        chunk_ready = asyncio.Event()
+        outcome = {}
+        consumer_gone = threading.Event()  # Set when this generator is closed, so that its reader thread ends
+
+        def wake_up():
+            try:
+                loop.call_soon_threadsafe(chunk_ready.set)
+            except RuntimeError:
+                pass  # Event loop already closed, nobody is waiting for audio anymore
+
+        def reader():
+            stream = self._stream(consumer_gone)
+            try:
+                for arr in stream:
+                    chunks.append(arr)
+                    wake_up()
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                stream.close()
+                outcome["done"] = True
+                wake_up()
+
+        threading.Thread(target=reader, name="MicrophoneReader", daemon=True).start()
+        try:
+            while True:
+                await chunk_ready.wait()
+                chunk_ready.clear()
+                # Checked before draining: once done is set, the thread has appended its last chunk
+                done = "done" in outcome
+                while chunks:
+                    yield chunks.popleft()
+                if done:
+                    if "error" in outcome:
+                        raise outcome["error"]
+                    return
+        finally:
+            consumer_gone.set()
+
+    async def _stream_nonblocking(self):
+        """Read the periods of a non-blocking PCM from the event loop, waiting for its poll descriptors to be readable.
+
+        There is no automatic reconnection in this mode: an ALSA error stops the microphone and is raised as a
+        MicrophoneDisconnectedException.
+        """
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        fds = []
+        try:
+            while self.is_recording.is_set():
+                error = None
+                # Under the lock, so that a stop() from another thread can't close the PCM in the middle of the read.
+                # The read doesn't block in this mode, holding the lock doesn't stall the event loop.
+                with self._pcm_lock:
+                    pcm = self._pcm
+                    if pcm is None:
+                        break  # Closed by stop()
+                    if not fds:
+                        fds = [fd for fd, _ in pcm.polldescriptors()]
+                        for fd in fds:
+                            loop.add_reader(fd, readable.set)
+                    try:
+                        length, data = pcm.read()
+                    except alsaaudio.ALSAAudioError as e:
+                        error = e
+                if error is not None:
+                    if not self.is_recording.is_set():
+                        break  # Stopping, not a disconnection
+                    logger.error(f"ALSA error while reading in non-blocking mode: {error}")
+                    self.stop()
+                    raise MicrophoneDisconnectedException(f"Microphone read failed: {error}")
+                if length > 0:
+                    yield np.frombuffer(data, dtype=self._np_dtype)
+                    continue
+                # No complete period yet (-EAGAIN) or overrun (-EPIPE, recovered by the next read): wait for data.
+                # The timer bounds the wait, so that a stop() from another thread is noticed even without data.
+                readable.clear()
+                timer = loop.call_later(0.5, readable.set)
+                await readable.wait()
+                timer.cancel()
+        finally:
+            for fd in fds:
+                loop.remove_reader(fd)
+
+    def stream_into(self, dest: np.ndarray):
+        """Like stream(), but write each audio chunk into a caller-owned buffer instead of allocating a new array.
+
+        The content of dest is only valid until the generator is resumed, as the next chunk overwrites it.
+
+        Args:
+            dest (np.ndarray): A C-contiguous array with the microphone dtype, large enough to hold
+                periodsize * channels samples.
+
+        Yields:
+            int: The number of samples written at the beginning of dest.
+
+        Raises:
+            ValueError: If dest has the wrong dtype, is not C-contiguous or is too small.
+        """
+        if dest.dtype != self.dtype:
+            raise ValueError(f"Destination buffer dtype must be {self.dtype}, not {dest.dtype}.")
+        if not dest.flags.c_contiguous:
+            raise ValueError("Destination buffer must be C-contiguous.")
+        if dest.nbytes < self._bytes_per_period:
+            raise ValueError(f"Destination buffer must hold at least {self.periodsize * self.channels} samples.")
+
+        buf = memoryview(dest.reshape(-1).view(np.uint8))
+        itemsize = dest.itemsize
+        for data in self._read_periods():
+            nbytes = len(data)
+            if nbytes > buf.nbytes:
+                logger.error(f"PCM data ({nbytes} bytes) does not fit the destination buffer ({buf.nbytes} bytes).")
+                continue
+            buf[:nbytes] = data
+            yield nbytes // itemsize
+
+    def _read_periods(self, abandoned: threading.Event = None):
+        """Return an iterator over the raw PCM data of each period read from the device, handling reconnections.
+
+        The per-period timing logs are chained in only if debug logging is enabled when the stream starts, so that the
+        regular read loop doesn't pay for them.
+
+        Args:
+            abandoned (threading.Event): Optional event ending the iteration when set, see _read_pcm().
+
+        Raises:
+            MicrophoneException: If the microphone is in non-blocking mode, which only supports stream_async().
+        """
+        if self.nonblocking:
+            raise MicrophoneException("Non-blocking microphones can only be read with stream_async().")
+        periods = self._read_pcm(abandoned)
+        if logger.isEnabledFor(logging.DEBUG):
+            periods = self._log_period_timing(periods)
+        return periods
+
+    def _log_period_timing(self, periods):
+        """Pass the periods through, logging the time elapsed between them and the resulting effective sample rate."""
+        perf_counter = time.perf_counter
+        itemsize = self.dtype.itemsize
+        prev_time = perf_counter()
+        for data in periods:
+            now = perf_counter()
+            elapsed = now - prev_time
+            prev_time = now
+            if elapsed > 0:
+                samples = len(data) // itemsize
+                logger.debug(
+                    "Chunk: %d samples, elapsed=%.4fs, effective_rate=%.1fHz, requested=%d",
+                    samples,
+                    elapsed,
+                    samples / elapsed,
+                    self.sample_rate,
+                )
+            yield data
+
+    def _read_pcm(self, abandoned: threading.Event = None):
+        """Yield the raw PCM data of each period read from the device, reconnecting it if it's unplugged.
+
+        Args:
+            abandoned (threading.Event): Optional event set when the consumer of the stream goes away (e.g. the
+                stream_async() reader thread after its consumer stopped iterating). It ends the iteration without
+                stopping the microphone, including while waiting for a disconnected device to come back.
+        """
         reconnect_attempts = 0
         while self.is_recording.is_set():
+            if abandoned is not None and abandoned.is_set():
+                logger.debug("Microphone stream abandoned by its consumer.")
+                return
             if self._pcm is None:
                 if reconnect_attempts >= self.max_reconnect_attempts:
                     logger.error("Max reconnect attempts reached. Giving up.")
@@ -344,7 +690,11 @@ class Microphone:
                     # the AppController handles the termination.
                     raise MicrophoneDisconnectedException("Max reconnect attempts reached while trying to reconnect microphone")
                 logger.info(f"Waiting for microphone to be reconnected... (attempt {reconnect_attempts + 1})")
-                time.sleep(self.reconnect_delay)
+                # Wait on the event rather than sleeping, so that stop() ends the wait and releases the thread at once
+                if self._wait_reconnect_delay(abandoned):
+                    break
+                if abandoned is not None and abandoned.is_set():
+                    continue  # Don't reopen the device for nobody, returns at the top of the loop
                 try:
                     self.connect()
                     logger.info("Microphone reconnected successfully.")
@@ -353,38 +703,22 @@ class Microphone:
                     reconnect_attempts += 1
                 continue
             try:
-                if debug_mode:
-                    t0 = time.perf_counter()
+                # The lock is what keeps stop() from closing the PCM while a read is blocked in ALSA, which would free
+                # the handle under it. It's taken once per period and uncontended, except while stopping.
                 with self._pcm_lock:
+                    if self._pcm is None:
+                        continue  # Closed by stop() since the check above
                     l, data = self._pcm.read()
-                if debug_mode:
-                    t1 = time.perf_counter()
                 if l > 0:
-                    try:
-                        arr = np.frombuffer(data, dtype=self._dtype)
-                    except Exception as e:
-                        logger.error(f"Error converting PCM data to numpy array: {e}")
-                        continue
-                    if debug_mode:
-                        elapsed = t1 - (prev_time if prev_time is not None else t0)
-                        prev_time = t1
-                        if elapsed > 0:
-                            effective_rate = arr.size / elapsed
-                            logger.debug(
-                                "Chunk: %d samples, elapsed=%.4fs, effective_rate=%.1fHz, requested=%d",
-                                arr.size,
-                                elapsed,
-                                effective_rate,
-                                self.sample_rate,
-                            )
-                    yield arr
+                    yield data
                     reconnect_attempts = 0  # reset on success
                 else:
                     logger.debug("No audio data read from PCM device.")
 
             except alsaaudio.ALSAAudioError as e:
-                if self.device not in self._list_usb_microphones():
+                if not self._device_present(e):
                     logger.error(f"Microphone disconnected: {e}")
+                    self._clear_usb_microphones_cache()
                     with self._pcm_lock:
                         if self._pcm is not None:
                             try:
@@ -406,6 +740,25 @@ class Microphone:
         logger.warning("Microphone stream stopped, cleaning up resources")
         logger.debug(f"stream stopped - is_recording: {self.is_recording.is_set()}")
 
+    def _wait_reconnect_delay(self, abandoned: threading.Event = None) -> bool:
+        """Wait for reconnect_delay seconds before a reconnection attempt.
+
+        Returns:
+            bool: True if stop() was called meanwhile, False otherwise. Also returns early, with False, if abandoned
+                is set.
+        """
+        if abandoned is None:
+            return self._stop_requested.wait(self.reconnect_delay)
+        # Two events can't be waited on at once: wait on stop() in short slices, checking abandoned in between
+        deadline = time.monotonic() + self.reconnect_delay
+        while not abandoned.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._stop_requested.wait(min(remaining, 0.1)):
+                return True
+        return False
+
     @staticmethod
     def list_usb_devices() -> list:
         """Return a list of available USB microphone ALSA device names (plughw only).
@@ -421,6 +774,8 @@ class Microphone:
 
     def stop(self):
         """Close the PCM device if open."""
+        if hasattr(self, "_stop_requested"):
+            self._stop_requested.set()
         if not hasattr(self, "is_recording") or not self.is_recording.is_set():
             logger.warning("Microphone is not recording, nothing to stop.")
             return
@@ -435,14 +790,6 @@ class Microphone:
             logger.debug(f"Microphone stream Event is cleared: {self.is_recording}")
             logger.info(f"[stop] PCM device closed: {self.device}")
 
-    def __del__(self):
-        """Ensure PCM device is closed when the object is destroyed."""
-        try:
-            logger.warning("[__del__] Microphone __del__: cleaning up resources.")
-            self.stop()
-        except Exception as e:
-            logger.warning(f"Microphone __del__: stop() failed or already closed: {e}")
-
     def __enter__(self):
         """Context manager entry method to start the microphone stream."""
         logger.debug("Entering Microphone context manager.")
@@ -460,7 +807,7 @@ class Microphone:
         """Context manager exit method to stop the microphone stream."""
         logger.debug("Exiting Microphone context manager.")
         try:
-            logger.warning("[__exit__] Microphone __del__: cleaning up resources.")
+            logger.warning("[__exit__] Microphone: cleaning up resources.")
             self.stop()
         except Exception:
             logger.warning("Microphone is not recording, cannot exit context.")
@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: Copyright (C) ARDUINO SRL (http://www.arduino.cc)
+#
+# SPDX-License-Identifier: MPL-2.0
+
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+
+class AudioBufferPool:
+    """Bounded pool of preallocated audio buffers, recycled between the microphone and its consumers.
+
+    Buffers are taken with acquire() and given back with release() once the consumer is done with them. When the pool
+    is empty a new buffer is allocated, and buffers released while the pool is full are simply dropped, so a slow
+    consumer never blocks the producer. acquire() and release() can be called from different threads.
+    """
+
+    def __init__(self, capacity: int, nsamples: int, dtype: np.dtype):
+        """Initialize the pool with capacity preallocated buffers.
+
+        Args:
+            capacity (int): Maximum number of buffers kept in the pool.
+            nsamples (int): Number of samples of each buffer.
+            dtype (np.dtype): The numpy dtype of the samples.
+
+        Raises:
+            ValueError: If capacity or nsamples is not positive.
+        """
+        if capacity < 1 or nsamples < 1:
+            raise ValueError("capacity and nsamples must be greater than 0")
+        self.capacity = capacity
+        self.nsamples = nsamples
+        self.dtype = np.dtype(dtype)
+        self._free = deque(np.empty(nsamples, dtype=self.dtype) for _ in range(capacity))
+
+    def acquire(self) -> np.ndarray:
+        """Take a buffer from the pool, allocating a new one if the pool is empty. Its content is undefined."""
+        try:
+            return self._free.popleft()
+        except IndexError:
+            return np.empty(self.nsamples, dtype=self.dtype)
+
+    def release(self, buf: np.ndarray):
+        """Give a buffer back to the pool. Views of a pool buffer (e.g. a short chunk) release the whole buffer.
+
+        Args:
+            buf (np.ndarray): A buffer obtained from acquire(), or a view of it. It must not be used afterwards.
+        """
+        if buf.base is not None and isinstance(buf.base, np.ndarray):
+            buf = buf.base
+        if buf.shape != (self.nsamples,) or buf.dtype != self.dtype:
+            return  # Not one of ours
+        if len(self._free) < self.capacity:
+            self._free.append(buf)
+
+    @contextmanager
+    def borrow(self):
+        """Context manager acquiring a buffer and releasing it on exit."""
+        buf = self.acquire()
+        try:
+            yield buf
+        finally:
+            self.release(buf)
@@ -3,14 +3,19 @@
 # SPDX-License-Identifier: MPL-2.0
 
 import alsaaudio
+import logging
 import numpy as np
 import threading
-import queue
+import time
 import re
+from collections import deque
 from arduino.app_utils import Logger
 
 logger = Logger("Speaker")
 
+# USB_SPEAKER_<n> device macro, only matched on names already known to start with "USB_SPEAKER_"
+_USB_SPEAKER_RE = re.compile(r"USB_SPEAKER_(\d+)")
+
 
 class SpeakerException(Exception):
     """Custom exception for Speaker errors."""
@@ -24,6 +29,9 @@ class Speaker:
     USB_SPEAKER_1 = "USB_SPEAKER_1"
     USB_SPEAKER_2 = "USB_SPEAKER_2"
 
+    # (monotonic time, device list) of the last USB speakers enumeration, see _list_usb_speakers_cached()
+    _usb_speakers_cache: tuple[float, list] = (float("-inf"), [])
+
     # Mapping ALSA format string -> (PCM_FORMAT_*, numpy dtype)
     FORMAT_MAP = {
         "S8": ("PCM_FORMAT_S8", np.int8),
@@ -75,8 +83,11 @@ class Speaker:
                 Lower values (5-20) reduce latency for interactive audio.
                 Higher values (50-200) provide stability for streaming.
 
+        The device is resolved (USB_SPEAKER_<n> macros, mixer lookup) only when first needed, by start() or the volume
+        methods, so that constructing a speaker doesn't enumerate the ALSA cards.
+
         Raises:
-            SpeakerException: If the speaker cannot be initialized or if the device is busy.
+            SpeakerException: If the format is not supported.
         """
         logger.info(
             "Init Speaker with device=%s, sample_rate=%d, channels=%d, format=%s",
@@ -93,14 +104,36 @@ class Speaker:
         self._alsa_format, self._dtype = self.FORMAT_MAP[format]
         if self._dtype is None:
             raise NotImplementedError(f"Format {self.format} is not supported for numpy conversion.")
+        # Resolved once, rather than by name on every PCM open and fallback
+        self._alsa_format_const = getattr(alsaaudio, self._alsa_format, None)
+        if self._alsa_format_const is None:
+            raise SpeakerException(f"Format {format} is not supported by this ALSA version.")
+        self._np_dtype = np.dtype(self._dtype)
+        if self._np_dtype.kind in "iu":
+            # Mapping of normalized float samples in [-1.0, 1.0] to the integer range, see _convert_to_pcm()
+            bits = 24 if format.startswith("S24") else self._np_dtype.itemsize * 8
+            self._float_scale = float((1 << (bits - 1)) - 1)
+            self._float_offset = float(1 << (bits - 1)) if self._np_dtype.kind == "u" else 0.0
+            # float32 can't represent the 32 bit full scale exactly, which would overflow the cast
+            self._float_work_dtype = np.dtype(np.float64 if bits > 16 else np.float32)
+        self._prepare = self._prepare_any  # Turns play() data into queue blocks, selected by start()
+        self._scratch: np.ndarray = None  # Work buffer of the float conversions, reused while the block shape is unchanged
         self._pcm: alsaaudio.PCM = None
         self._pcm_lock = threading.Lock()
         self._native_rate = None
         self._is_reproducing = threading.Event()
         self._periodsize = periodsize  # Store configured periodsize (None = hardware default)
-        self._playing_queue: bytes = queue.Queue(maxsize=queue_maxsize)  # Queue for audio data to play with limited capacity
-        self.device = self._resolve_device(device)
-        self._mixer: alsaaudio.Mixer = self._load_mixer()
+        # Audio data to play with limited capacity (bytes or byte views of arrays owned by the speaker, so that len()
+        # is always a size in bytes), handed over to the playback thread. deque appends and pops are atomic, so the
+        # two events are the only synchronization: no lock is taken per block.
+        self._queue_maxsize = queue_maxsize
+        self._playing_queue: deque[bytes | memoryview] = deque(maxlen=queue_maxsize if queue_maxsize > 0 else None)
+        self._data_ready = threading.Event()
+        self._space_available = threading.Event()
+        self._space_available.set()
+        self.device = device  # Replaced by the resolved ALSA device name, see _ensure_resolved()
+        self._mixer: alsaaudio.Mixer = None
+        self._resolved = False
 
     def _resolve_device(self, device: str) -> str:
         """Resolve the ALSA device name, handling USB_SPEAKER_1/2 macros and explicit device names.
@@ -115,7 +148,7 @@ class Speaker:
         """
         logger.debug(f"Resolving device: {device}")
         if not device or device.startswith("USB_SPEAKER_"):
-            usb_devices = self._list_usb_speakers()
+            usb_devices = self._list_usb_speakers_cached()
             logger.info(f"Available USB speakers: {usb_devices}")
             if not usb_devices:
                 logger.error("No USB speakers found for USB_SPEAKER_1/2 macro.")
@@ -125,7 +158,7 @@ class Speaker:
                 return usb_devices[0]
 
             # Detect device via regex
-            match = re.search(r"USB_SPEAKER_(\d+)", device)
+            match = _USB_SPEAKER_RE.match(device)
             if match:
                 device_number = int(match.group(1))
                 logger.info(f"Detected USB_SPEAKER_{device_number} from device string: {device}")
@@ -139,6 +172,21 @@ class Speaker:
         logger.info(f"Using explicit device: {device}")
         return device
 
+    @staticmethod
+    def _list_usb_speakers_cached(ttl: float = 2.0) -> list:
+        """Like _list_usb_speakers(), but reuse the last enumeration if it is less than ttl seconds old.
+
+        The cache is shared by all the Speaker instances, so that creating several speakers in a row enumerates the
+        ALSA cards and PCMs only once.
+        """
+        now = time.monotonic()
+        enumerated_at, usb_devices = Speaker._usb_speakers_cache
+        if now - enumerated_at < ttl:
+            return usb_devices
+        usb_devices = Speaker._list_usb_speakers()
+        Speaker._usb_speakers_cache = (now, usb_devices)
+        return usb_devices
+
     @staticmethod
     def _list_usb_speakers() -> list:
         """Return an ordered list of ALSA device names for available USB speaker (plughw only)."""
@@ -146,16 +194,16 @@ class Speaker:
         try:
             cards = alsaaudio.cards()
             card_indexes = alsaaudio.card_indexes()
-            card_map = {name: idx for idx, name in zip(card_indexes, cards)}
-            for card_name, card_index in card_map.items():
+            plughw_devices = None  # plughw PCMs grouped by card name, enumerated once and only if there's a USB card
+            for card_name, card_index in zip(cards, card_indexes):
                 try:
                     desc = alsaaudio.card_name(card_index)
                     desc_str = desc[1] if isinstance(desc, tuple) else str(desc)
                     if "usb" in card_name.lower() or "usb" in desc_str.lower():
                         # Find all plughw devices for this card
-                        for dev in alsaaudio.pcms(alsaaudio.PCM_PLAYBACK):
-                            if dev.startswith("plughw:CARD=") and f"CARD={card_name}" in dev:
-                                usb_devices.append(dev)
+                        if plughw_devices is None:
+                            plughw_devices = Speaker._group_plughw_devices(alsaaudio.pcms(alsaaudio.PCM_PLAYBACK))
+                        usb_devices.extend(plughw_devices.get(card_name, ()))
                 except Exception as e:
                     logger.debug(f"Error parsing card info for {card_name}: {e}")
 
@@ -164,6 +212,16 @@ class Speaker:
         logger.info(f"USB speakers found: {usb_devices}")
         return usb_devices
 
+    @staticmethod
+    def _group_plughw_devices(pcms: list) -> dict:
+        """Group the "plughw:CARD=<name>,..." devices among pcms by card name, keeping their order."""
+        devices = {}
+        prefix = "plughw:CARD="
+        for dev in pcms:
+            if dev.startswith(prefix):
+                devices.setdefault(dev[len(prefix) :].split(",", 1)[0], []).append(dev)
+        return devices
+
     @staticmethod
     def list_usb_devices() -> list:
         """Return a list of available USB speaker ALSA device names (plughw only).
@@ -189,7 +247,7 @@ class Speaker:
             try:
                 self._pcm.setchannels(self.channels)
                 self._pcm.setrate(self.sample_rate)
-                self._pcm.setformat(getattr(alsaaudio, self._alsa_format))
+                self._pcm.setformat(self._alsa_format_const)
 
                 # Configure periodsize only if explicitly set (for real-time synthesis)
                 # Otherwise use hardware-optimal default (for streaming/file playback)
@@ -223,7 +281,7 @@ class Speaker:
                     )
                     self._pcm.setchannels(self.channels)
                     self._pcm.setrate(self.sample_rate)
-                    self._pcm.setformat(getattr(alsaaudio, self._alsa_format))
+                    self._pcm.setformat(self._alsa_format_const)
 
                     # Configure periodsize only if explicitly set
                     if self._periodsize is not None:
@@ -248,7 +306,7 @@ class Speaker:
                     )
                     self._pcm.setchannels(self.channels)
                     self._native_rate = self._pcm.rate()
-                    self._pcm.setformat(getattr(alsaaudio, self._alsa_format))
+                    self._pcm.setformat(self._alsa_format_const)
 
                     # Configure periodsize even in native fallback for consistency
                     if self._periodsize is not None:
@@ -273,22 +331,25 @@ class Speaker:
             raise SpeakerException(f"Unexpected error opening spaker: {e}")
 
     def _load_mixer(self) -> alsaaudio.Mixer:
+        if "CARD=" not in self.device:
+            return None  # Not a CARD=<name> device, e.g. a numeric hw:1,0: no mixer lookup
+        # The card name is parsed from the device ("plughw:CARD=<name>,DEV=0") and looked up directly
+        card_name = self.device.split("CARD=", 1)[1].split(",", 1)[0]
         try:
-            cards = alsaaudio.cards()
-            card_indexes = alsaaudio.card_indexes()
-            for card_name, card_index in zip(cards, card_indexes):
-                logger.debug(f"Checking Card {card_name} (index {card_index}, device {self.device})")
-                if f"CARD={card_name}," in self.device:
-                    try:
-                        mixer = alsaaudio.mixers(cardindex=card_index)
-                        if len(mixer) == 0:
-                            logger.warning(f"No mixers found for card {card_name}.")
-                            continue
-                        mx = alsaaudio.Mixer(mixer[0])
-                        logger.debug(f"Loaded mixer: {mixer[0]} for card {card_name}")
-                        return mx
-                    except alsaaudio.ALSAAudioError as e:
-                        logger.debug(f"Failed to load mixer for card {card_name}: {e}")
+            card_index = dict(zip(alsaaudio.cards(), alsaaudio.card_indexes())).get(card_name)
+            logger.debug(f"Checking Card {card_name} (index {card_index}, device {self.device})")
+            if card_index is None:
+                return None
+            try:
+                mixer = alsaaudio.mixers(cardindex=card_index)
+                if len(mixer) == 0:
+                    logger.warning(f"No mixers found for card {card_name}.")
+                    return None
+                mx = alsaaudio.Mixer(mixer[0])
+                logger.debug(f"Loaded mixer: {mixer[0]} for card {card_name}")
+                return mx
+            except alsaaudio.ALSAAudioError as e:
+                logger.debug(f"Failed to load mixer for card {card_name}: {e}")
 
             # No suitable mixer found, return None
             return None
@@ -296,6 +357,18 @@ class Speaker:
             logger.warning(f"Error loading mixer {self.device}: {e}")
             return None
 
+    def _ensure_resolved(self):
+        """Resolve the device and load its mixer, on first use.
+
+        Raises:
+            SpeakerException: If no USB speaker matches a USB_SPEAKER_<n> macro.
+        """
+        if self._resolved:
+            return
+        self.device = self._resolve_device(self.device)
+        self._mixer = self._load_mixer()
+        self._resolved = True
+
     def get_volume(self) -> int:
         """Get the current volume level of the speaker.
 
@@ -305,6 +378,7 @@ class Speaker:
         Raises:
             SpeakerException: If the mixer is not available or if volume cannot be retrieved.
         """
+        self._ensure_resolved()
         if self._mixer is None:
             return -1  # No mixer available, return -1 to indicate no volume control
         try:
@@ -328,6 +402,7 @@ class Speaker:
         Raises:
             SpeakerException: If the mixer is not available or if volume cannot be set.
         """
+        self._ensure_resolved()
         if self._mixer is None:
             return
         if not (0 <= volume <= 100):
@@ -344,25 +419,41 @@ class Speaker:
 
     def _clear_queue(self):
         """Clear the playback queue."""
-        with self._pcm_lock:
-            while not self._playing_queue.empty():
-                try:
-                    self._playing_queue.get_nowait()
-                except queue.Empty:
-                    break
+        self._playing_queue.clear()
+        self._space_available.set()
         logger.debug("Playback queue cleared.")
 
-    def start(self):
-        """Start the spaker stream by opening the PCM device."""
+    def start(self, input_kind: str = None):
+        """Start the spaker stream by opening the PCM device.
+
+        Args:
+            input_kind (str): What play() will be given, to skip its per-call type dispatch (default: None = any):
+                "bytes" for PCM bytes, "ndarray_native" for arrays already with the dtype of the speaker format,
+                "ndarray_float" for arrays to convert (e.g. normalized float samples). The data isn't checked against
+                the declared kind.
+
+        Raises:
+            SpeakerException: If the device cannot be resolved or opened.
+            ValueError: If input_kind is not one of the supported kinds.
+        """
         if self._is_reproducing.is_set():
             raise RuntimeError("Spaker is already reproducing audio, cannot start again.")
+        preparers = {
+            None: self._prepare_any,
+            "bytes": self._prepare_bytes,
+            "ndarray_native": self._prepare_native,
+            "ndarray_float": self._prepare_converted,
+        }
+        if input_kind not in preparers:
+            raise ValueError(f"Unsupported input kind: {input_kind}")
+        self._prepare = preparers[input_kind]
+        self._ensure_resolved()
         self._clear_queue()
         self._open_pcm()
         self._is_reproducing.set()
         logger.debug(f"Spaker stream event is set: {self._is_reproducing}, starting playback thread.")
-        with self._pcm_lock:
-            self._playback_thread = threading.Thread(target=self._playback_loop, daemon=True)
-            self._playback_thread.start()
+        self._playback_thread = threading.Thread(target=self._playback_loop, name=f"SpeakerPlayback-{self.device}", daemon=True)
+        self._playback_thread.start()
 
     def stop(self):
         """Close the PCM device if open."""
@@ -373,15 +464,23 @@ class Speaker:
         # Stop the playback thread
         logger.debug("Closing playback thread.")
         self._is_reproducing.clear()
-        with self._pcm_lock:
-            self._playback_thread.join(timeout=5)
-            self._playback_thread = None
+        # Wake up the playback thread and any play() waiting for room, so that they see the cleared event at once
+        self._data_ready.set()
+        self._space_available.set()
+        # Joined without the lock, which only guards the PCM teardown below
+        self._playback_thread.join(timeout=5)
+        playback_stuck = self._playback_thread.is_alive()
+        self._playback_thread = None
 
         logger.debug("Closing PCM device.")
         try:
             with self._pcm_lock:
                 if self._pcm is not None:
-                    self._pcm.close()
+                    if playback_stuck:
+                        # Still writing without the lock: the PCM is closed when the thread drops it instead
+                        logger.warning("Playback thread did not stop in time, leaving the PCM device to it.")
+                    else:
+                        self._pcm.close()
                     self._pcm = None
 
             self._clear_queue()
@@ -420,60 +519,156 @@ class Speaker:
         return False  # Do not suppress exceptions
 
     def _playback_loop(self):
-        """Thread function to handle audio playback."""
+        """Thread function to handle audio playback.
+
+        Per block, the loop only pops from the deque and checks events, all of which is thread safe without the GIL
+        too, and the ALSA write itself releases the GIL: the playback threads of several speakers run in parallel,
+        truly so on free-threaded Python builds.
+        """
         logger.debug("Starting playback thread.")
-        queue_warn_threshold = self._playing_queue.maxsize * 0.8 if self._playing_queue.maxsize > 0 else 40
+        playing_queue = self._playing_queue
+        # The PCM is opened before this thread starts and closed by stop() only after joining it, so it's used here
+        # without the lock: stop() doesn't have to wait for a blocked write to complete.
+        pcm = self._pcm
+        # Blocks already queued are joined into writes of up to 4 periods (1024 frames each if the hardware default
+        # is used), so that a producer of many small blocks doesn't cost one ALSA write each
+        max_write_bytes = (self._periodsize or 1024) * self.channels * self._np_dtype.itemsize * 4
+        # With an explicit period size, writes followed by more queued audio are cut to whole periods: the tail is
+        # kept in pending and written first with the next blocks, or alone if nothing else comes
+        period_bytes = self._periodsize * self.channels * self._np_dtype.itemsize if self._periodsize else 0
+        pending = None
+        queue_warn_threshold = self._queue_maxsize * 0.8 if self._queue_maxsize > 0 else 40
+        last_queue_warning = float("-inf")
         while self._is_reproducing.is_set():
             try:
-                data = self._playing_queue.get(timeout=1)  # Wait for audio data
+                if not playing_queue and pending is None:
+                    # Cleared before checking again, so that a block queued in between still wakes us up
+                    self._data_ready.clear()
+                    if not playing_queue:
+                        self._data_ready.wait(timeout=1)  # Wait for audio data
+                        continue
+                data = self._take_blocks(max_write_bytes, pending)
+                pending = None
                 if data is None:
-                    continue  # Skip if no data is available
-
-                # Check queue depth periodically
-                queue_size = self._playing_queue.qsize()
+                    continue  # Cleared by stop() in the meantime
+                self._space_available.set()
+                if period_bytes and playing_queue:
+                    tail = len(data) % period_bytes
+                    if tail and len(data) > tail:
+                        view = memoryview(data)
+                        data, pending = view[:-tail], view[-tail:]
+
+                # Check queue depth, warning at most once per second while it stays high
+                queue_size = len(playing_queue)
                 if queue_size > queue_warn_threshold:
-                    logger.warning(
-                        f"Playback queue depth high: {queue_size}/{self._playing_queue.maxsize if self._playing_queue.maxsize > 0 else 'unlimited'}"
-                    )
+                    now = time.monotonic()
+                    if now - last_queue_warning >= 1.0:
+                        last_queue_warning = now
+                        logger.warning(
+                            "Playback queue depth high: %d/%s",
+                            queue_size,
+                            self._queue_maxsize if self._queue_maxsize > 0 else "unlimited",
+                        )
 
-                with self._pcm_lock:
-                    if self._pcm is not None:
-                        try:
-                            written = self._pcm.write(data)
-
-                            # Check for ALSA errors (negative return values)
-                            if written < 0:
-                                # Negative values are ALSA error codes
-                                if written == -32:  # -EPIPE: buffer underrun
-                                    logger.debug(f"PCM buffer underrun (-EPIPE), recovering...")
-                                    try:
-                                        self._pcm.pause(0)  # Resume playback
-                                    except Exception:
-                                        pass
-                                else:
-                                    logger.warning(f"PCM write error code: {written}")
-                            elif written == 0:
-                                logger.debug(f"PCM write returned 0 frames (buffer full or device busy)")
-                        except Exception as pcm_err:
-                            logger.warning(f"PCM write exception: {type(pcm_err).__name__}: {pcm_err}")
-                            # Try to recover from underrun
+                try:
+                    written = pcm.write(data)
+
+                    # Check for ALSA errors (negative return values)
+                    if written < 0:
+                        # Negative values are ALSA error codes
+                        if written == -32:  # -EPIPE: buffer underrun
+                            logger.debug("PCM buffer underrun (-EPIPE), recovering...")
                             try:
-                                self._pcm.pause(0)  # Resume if paused due to underrun
+                                pcm.pause(0)  # Resume playback
                             except Exception:
                                 pass
-                self._playing_queue.task_done()  # Mark the task as done
-            except queue.Empty:
-                continue
+                        else:
+                            logger.warning("PCM write error code: %d", written)
+                    elif written == 0:
+                        logger.debug("PCM write returned 0 frames (buffer full or device busy)")
+                except Exception as pcm_err:
+                    logger.warning("PCM write exception: %s: %s", type(pcm_err).__name__, pcm_err)
+                    # Try to recover from underrun
+                    try:
+                        pcm.pause(0)  # Resume if paused due to underrun
+                    except Exception:
+                        pass
             except Exception as e:
                 logger.error(f"Playback thread error: {e}")
                 break
         logger.debug("Playback thread stopped.")
 
+    @staticmethod
+    def _warn_if_clipping(max_val: float):
+        """Warn that normalized float samples will be clipped, given their largest absolute value."""
+        if max_val > 1.0:
+            logger.warning(f"Audio data exceeds range: max={max_val:.3f} (should be <=1.0)")
+
+    def _take_blocks(self, max_bytes: int, head: bytes | memoryview = None) -> bytes | memoryview | None:
+        """Pop the next queued block, joined with the following ones already queued up to max_bytes.
+        If head is given, it's used as the first block instead. Returns None if there's no block at all.
+        """
+        playing_queue = self._playing_queue
+        if head is not None:
+            data = head
+        else:
+            try:
+                data = playing_queue.popleft()
+            except IndexError:
+                return None
+        if not playing_queue or len(data) >= max_bytes:
+            return data
+        chunks = [data]
+        nbytes = len(data)
+        while nbytes < max_bytes:
+            try:
+                chunk = playing_queue.popleft()
+            except IndexError:
+                break
+            chunks.append(chunk)
+            nbytes += len(chunk)
+        return b"".join(chunks)
+
+    def _convert_to_pcm(self, data: np.ndarray) -> np.ndarray:
+        """Convert audio samples to the PCM sample format.
+
+        Float samples are expected normalized in [-1.0, 1.0]: for integer formats they are clipped to that range and
+        scaled to the full integer range, in a single vectorized pass over a reused work buffer. Other conversions are
+        plain casts.
+
+        Returns:
+            np.ndarray: A new C-contiguous array, owned by the caller.
+        """
+        if data.dtype.kind != "f":
+            return data.astype(self._np_dtype, order="C")
+        # Clipping check, done only if its warning can be logged
+        check_range = data.size > 0 and logger.isEnabledFor(logging.WARNING)
+        if self._np_dtype.kind == "f":
+            if check_range:
+                self._warn_if_clipping(max(data.max(), -data.min()))
+            return data.astype(self._np_dtype, order="C")
+        # Taken out of the instance while in use, so that concurrent play() calls never share it
+        tmp, self._scratch = self._scratch, None
+        if tmp is None or tmp.shape != data.shape:
+            tmp = np.empty(data.shape, dtype=self._float_work_dtype)
+        if check_range:
+            # Measured in the work buffer, which the conversion overwrites next: no temporary array is allocated
+            np.abs(data, out=tmp)
+            self._warn_if_clipping(tmp.max())
+        np.clip(data, -1.0, 1.0, out=tmp)
+        np.multiply(tmp, self._float_scale, out=tmp)
+        if self._float_offset:
+            np.add(tmp, self._float_offset, out=tmp)
+        out = tmp.astype(self._np_dtype)
+        self._scratch = tmp
+        return out
+
     def play(self, data: bytes | np.ndarray, block_on_queue: bool = False):
         """Play audio data through the speaker.
 
         Args:
-            data (bytes|np.ndarray): Audio data to play as bytes or np.ndarray.
+            data (bytes|np.ndarray): Audio data to play as bytes or np.ndarray. Float arrays are expected normalized
+                in [-1.0, 1.0] and are scaled to the integer formats.
             block_on_queue (bool): If True, block until the queue has space for the data.
 
         Raises:
@@ -482,20 +677,51 @@ class Speaker:
         if not self._is_reproducing.is_set():
             raise SpeakerException("Spaker is not started, cannot play audio.")
 
-        try:
-            if isinstance(data, bytes):
-                self._playing_queue.put(data, block=block_on_queue)
-            elif isinstance(data, np.ndarray):
-                # Debug: check for clipping before conversion
-                max_val = np.max(np.abs(data))
-                if max_val > 1.0:
-                    logger.warning(f"Audio data exceeds range: max={max_val:.3f} (should be <=1.0)")
-
-                # Convert numpy array to bytes
-                data_bytes = data.astype(self._dtype).tobytes()
-                self._playing_queue.put(data_bytes, block=block_on_queue)
-            else:
-                raise TypeError("Audio data must be bytes or numpy array.")
-        except queue.Full:
-            # logger.warning("Playback queue is full, dropping oldest data.")
-            self._playing_queue.get_nowait()
+        data_bytes = self._prepare(data)
+        if block_on_queue:
+            self._wait_for_space()
+        # When the queue is full, the bounded deque drops the oldest data
+        self._playing_queue.append(data_bytes)
+        self._data_ready.set()
+
+    def _prepare_any(self, data: bytes | np.ndarray) -> bytes | memoryview:
+        """Turn audio data of any supported type into a block for the playback queue."""
+        if isinstance(data, bytes):
+            return data
+        elif isinstance(data, np.ndarray):
+            if data.dtype == self._np_dtype:
+                return self._prepare_native(data)
+            return self._prepare_converted(data)
+        else:
+            raise TypeError("Audio data must be bytes or numpy array.")
+
+    @staticmethod
+    def _prepare_bytes(data: bytes) -> bytes:
+        return data
+
+    @staticmethod
+    def _prepare_native(data: np.ndarray) -> bytes:
+        # Already in the PCM sample format: copied straight to bytes, without conversion nor range check
+        return data.tobytes()
+
+    def _prepare_converted(self, data: np.ndarray) -> memoryview:
+        # The converted array is new and owned here: it's queued without copy, alsaaudio writes from its buffer
+        return memoryview(self._convert_to_pcm(data)).cast("B")
+
+    def _wait_for_space(self):
+        """Wait until the playback queue can take one more block without dropping the oldest one.
+
+        Raises:
+            SpeakerException: If the speaker is stopped while waiting.
+        """
+        maxsize = self._queue_maxsize
+        if maxsize <= 0:
+            return
+        while len(self._playing_queue) >= maxsize:
+            # Cleared before checking again, so that a block played in between still wakes us up
+            self._space_available.clear()
+            if len(self._playing_queue) < maxsize:
+                break
+            self._space_available.wait(timeout=1)
+            if not self._is_reproducing.is_set():
+                raise SpeakerException("Spaker was stopped while waiting to play audio.")
@@ -2,17 +2,32 @@
 #
 # SPDX-License-Identifier: MPL-2.0
 
+import functools
 import threading
 import time
 import cv2
 import io
 import os
 import re
+import numpy as np
 from PIL import Image
 from arduino.app_utils import Logger
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # PyTurboJPEG is optional and needs libturbojpeg, fall back to OpenCV
+    _turbo_jpeg = None
+
 logger = Logger("USB Camera")
 
+# Numeric index at the end of the /dev/v4l/by-id/ link names
+_V4L_INDEX_RE = re.compile(r"index(\d+)$")
+
+# Quality of the JPEG images produced when compression is enabled
+_JPEG_QUALITY = 85
+
 
 class CameraReadError(Exception):
     """Exception raised when the specified camera cannot be found."""
@@ -26,6 +41,46 @@ class CameraOpenError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=1)
+def _get_video_devices_by_index() -> dict[int, str]:
+    """Reads symbolic links in /dev/v4l/by-id/, resolves them, and returns a
+    dictionary mapping the numeric index to the system /dev/videoX device.
+
+    The result is cached: callers clear the cache with _get_video_devices_by_index.cache_clear() when a camera isn't
+    found, so that newly plugged cameras are listed.
+
+    Returns:
+        dict[int, str]: a dict where keys are ordinal integer indices (e.g., 0, 1) and values are the
+        /dev/videoX device names (e.g., "0", "1").
+    """
+    devices_by_index = {}
+    directory_path = "/dev/v4l/by-id/"
+
+    try:
+        # A single directory scan, whose entries tell symbolic links apart without an extra stat
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if not entry.is_symlink():
+                    continue
+                # Find the numeric index at the end of the filename
+                match = _V4L_INDEX_RE.search(entry.name)
+                if match:
+                    try:
+                        # Only the name of the link target (e.g. "../../video0") is needed, no full resolution
+                        device_name = os.path.basename(os.readlink(entry.path))
+                    except OSError as e:
+                        logger.warning(f"Warning: Could not read link '{entry.name}': {e}. Skipping.")
+                        continue
+                    # Remove the "video" prefix to get just the number
+                    devices_by_index[int(match.group(1))] = device_name.replace("video", "")
+    except FileNotFoundError:
+        logger.error(f"Error: Directory '{directory_path}' not found.")
+    except OSError as e:
+        logger.error(f"Error accessing directory '{directory_path}': {e}")
+
+    return devices_by_index
+
+
 class USBCamera:
     """Represents an input peripheral for capturing images from a USB camera device.
     This class uses OpenCV to interface with the camera and capture images.
@@ -38,6 +93,7 @@ class USBCamera:
         fps: int = 10,
         compression: bool = False,
         letterbox: bool = False,
+        background_grab: bool = False,
     ):
         """Initialize the USB camera.
 
@@ -45,10 +101,16 @@ class USBCamera:
             camera (int): Camera index (default is 0 - index is related to the first camera available from /dev/v4l/by-id devices).
             resolution (tuple[int, int]): Resolution as (width, height). If None, uses default resolution.
             fps (int): Frames per second for the camera. If None, uses default FPS.
-            compression (bool): Whether to compress the captured images. If True, images are compressed to PNG format.
+            compression (bool): Whether to compress the captured images. If True, images are compressed to JPEG format.
             letterbox (bool): Whether to apply letterboxing to the captured images.
+            background_grab (bool): Whether a background thread keeps reading the camera frames, so that a capture
+                takes the latest one instead of waiting for the camera and decoding it. The camera keeps streaming
+                and decoding frames between captures.
         """
-        video_devices = self._get_video_devices_by_index()
+        video_devices = _get_video_devices_by_index()
+        if camera not in video_devices:
+            _get_video_devices_by_index.cache_clear()  # Maybe plugged since the last enumeration
+            video_devices = _get_video_devices_by_index()
         if camera in video_devices:
             self.camera = int(video_devices[camera])
         else:
@@ -61,8 +123,15 @@ class USBCamera:
         self.fps = fps
         self.compression = compression
         self.letterbox = letterbox
+        self.background_grab = background_grab
         self._cap = None
+        self._grab_thread: threading.Thread = None
+        self._grab_stop = threading.Event()
+        self._frame_grabbed = threading.Event()  # Set when a frame was read since the last capture
+        self._grabbed_frame: cv2.typing.MatLike = None
+        self._grab_failed = False
         self._cap_lock = threading.Lock()
+        self._letterbox_buf: np.ndarray = None  # Reused by the letterboxed captures converted before being returned
         self._last_capture_time_monotonic = time.monotonic()
         if self.fps > 0:
             self.desired_interval = 1.0 / self.fps
@@ -76,15 +145,18 @@ class USBCamera:
         Returns:
             PIL.Image.Image | None: The captured frame as a PIL Image, or None if no frame is available.
         """
-        image_bytes = self._extract_frame()
+        # Uncompressed frames are kept in BGR order: PIL swaps the channels while copying them into the image, which
+        # saves a separate conversion pass over the frame
+        image_bytes = self._extract_frame(rgb=False)
         if image_bytes is None:
             return None
         try:
             if self.compression:
-                # If compression is enabled, we expect image_bytes to be in PNG format
+                # If compression is enabled, we expect image_bytes to be in JPEG format
                 return Image.open(io.BytesIO(image_bytes))
             else:
-                return Image.fromarray(image_bytes)
+                h, w = image_bytes.shape[:2]
+                return Image.frombuffer("RGB", (w, h), image_bytes, "raw", "BGR", 0, 1)
         except Exception as e:
             logger.exception(f"Error converting captured bytes to PIL Image: {e}")
             return None
@@ -92,6 +164,9 @@ class USBCamera:
     def capture_bytes(self) -> bytes | None:
         """Captures a frame from the camera and returns its raw bytes, blocking to respect the configured FPS.
 
+        With compression enabled these are the JPEG bytes, which can be forwarded as they are (e.g. streamed or saved
+        to a .jpg file) without the PIL image that capture() would build.
+
         Returns:
             bytes | None: The captured frame as a bytes array, or None if no frame is available.
         """
@@ -100,48 +175,120 @@ class USBCamera:
             return None
         return frame.tobytes()
 
-    def _extract_frame(self) -> cv2.typing.MatLike | None:
-        # Without locking, 'elapsed_time' could be a stale value but this scenario is unlikely to be noticeable in
+    def _extract_frame(self, rgb: bool = True) -> cv2.typing.MatLike | None:
+        """Read the next frame, respecting the configured FPS, and letterbox and compress it as configured.
+
+        Args:
+            rgb (bool): Whether uncompressed frames are converted to RGB, otherwise they're returned in BGR order.
+        """
+        # Without locking, 'deadline' could be a stale value but this scenario is unlikely to be noticeable in
         # practice, also its effects would disappear in the next capture. This optimization prevents us from calling
         # time.sleep while holding a lock.
-        current_time_monotonic = time.monotonic()
-        elapsed_time = current_time_monotonic - self._last_capture_time_monotonic
-        if elapsed_time < self.desired_interval:
-            sleep_duration = self.desired_interval - elapsed_time
-            time.sleep(sleep_duration)  # Keep time.sleep out of the locked section!
-
+        # Frames are paced on deadlines, one desired_interval after the previous one, rather than on the time elapsed
+        # since the previous read completed: the time spent reading doesn't add up to the interval.
+        deadline = self._last_capture_time_monotonic + self.desired_interval
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)  # Keep time.sleep out of the locked section!
+
+        if self._grab_thread is not None:
+            # The grab thread owns the reads: no need for the lock, which it holds while waiting for the next frame
+            ret, bgr_frame = self._take_grabbed()
+        else:
+            ret, bgr_frame = self._read_frame()
+        if not ret:
+            raise CameraReadError(f"Failed to read from camera {self.camera}.")
+        if bgr_frame is None:
+            # No frame available (or camera stopped), skip this iteration
+            return None
+        now = time.monotonic()
+        # Next deadline from this one to avoid drifting, unless it's more than a frame late (e.g. no capture for a
+        # while), which would let the next frames be read back to back to catch up
+        self._last_capture_time_monotonic = deadline if now - deadline < self.desired_interval else now
+        return self._convert_frame(bgr_frame, rgb)
+
+    def _read_frame(self) -> tuple[bool, cv2.typing.MatLike | None]:
+        """Read the next frame from the camera, as cv2.VideoCapture.read() does. No frame if the camera is stopped."""
         with self._cap_lock:
             if self._cap is None:
-                return None
-
-            ret, bgr_frame = self._cap.read()
-            if not ret:
-                raise CameraReadError(f"Failed to read from camera {self.camera}.")
-            self._last_capture_time_monotonic = time.monotonic()
-            if bgr_frame is None:
-                # No frame available, skip this iteration
-                return None
-
+                return True, None
+            return self._cap.read()
+
+    def _convert_frame(self, bgr_frame: cv2.typing.MatLike, rgb: bool) -> cv2.typing.MatLike | None:
+        """Letterbox and compress or convert a BGR frame as configured, see _extract_frame()."""
+        # The letterbox buffer is reused when the letterboxed frame is converted into a new one here, not returned as
+        # it is. It's taken out of the instance while in use, so that concurrent captures never share it.
+        reuse_buf = self.letterbox and (self.compression or rgb)
+        letterboxed = None
         try:
             if self.letterbox:
-                bgr_frame = self._letterbox(bgr_frame)
-            if self.compression:
-                success, rgb_frame = cv2.imencode(".png", bgr_frame)
-                if success:
-                    return rgb_frame
+                letterbox_buf = None
+                if reuse_buf:
+                    letterbox_buf, self._letterbox_buf = self._letterbox_buf, None
+                letterboxed = self._letterbox(bgr_frame, letterbox_buf)
+                if letterboxed is bgr_frame:
+                    letterboxed = None  # Already square, nothing to reuse
                 else:
-                    return None
-            else:
+                    bgr_frame = letterboxed
+            if self.compression:
+                return self._encode_jpeg(bgr_frame)
+            elif rgb:
                 return cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
+            else:
+                return bgr_frame
         except cv2.error as e:
             logger.exception(f"Error converting frame: {e}")
             return None
+        finally:
+            if reuse_buf and letterboxed is not None:
+                self._letterbox_buf = letterboxed
+
+    @staticmethod
+    def _encode_jpeg(bgr_frame: cv2.typing.MatLike) -> np.ndarray | None:
+        """Encode a BGR frame to JPEG, with libjpeg-turbo through PyTurboJPEG if available, OpenCV otherwise.
 
-    def _letterbox(self, frame: cv2.typing.MatLike) -> cv2.typing.MatLike:
+        Returns:
+            np.ndarray | None: The JPEG bytes as a uint8 array, or None if the encoding failed.
+        """
+        if _turbo_jpeg is not None:
+            return np.frombuffer(_turbo_jpeg.encode(bgr_frame, quality=_JPEG_QUALITY, pixel_format=TJPF_BGR), dtype=np.uint8)
+        success, jpeg_frame = cv2.imencode(".jpg", bgr_frame, [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY])
+        return jpeg_frame if success else None
+
+    def _take_grabbed(self) -> tuple[bool, cv2.typing.MatLike | None]:
+        """Take the latest frame read by the background thread, waiting for one if none was read since the last
+        capture.
+        """
+        if not self._frame_grabbed.wait(timeout=1):
+            # Reported as a read error if the thread is failing to read, as a missing frame otherwise
+            return not self._grab_failed, None
+        self._frame_grabbed.clear()
+        return True, self._grabbed_frame
+
+    def _grab_loop(self):
+        """Thread function reading the camera frames as they come, keeping only the latest one."""
+        logger.debug(f"Grab thread started for camera {self.camera}.")
+        while not self._grab_stop.is_set():
+            with self._cap_lock:
+                if self._cap is None:
+                    break
+                ret, bgr_frame = self._cap.read()
+            self._grab_failed = not ret
+            if ret and bgr_frame is not None:
+                self._grabbed_frame = bgr_frame
+                self._frame_grabbed.set()
+            else:
+                logger.warning(f"Failed to read from camera {self.camera}.")
+                self._grab_stop.wait(0.1)
+        logger.debug(f"Grab thread stopped for camera {self.camera}.")
+
+    def _letterbox(self, frame: cv2.typing.MatLike, dst: np.ndarray = None) -> cv2.typing.MatLike:
         """Applies letterboxing to the frame to make it square.
 
         Args:
             frame (cv2.typing.MatLike): The input frame to be letterboxed (as cv2 supported format - numpy like).
+            dst (np.ndarray): A previous letterboxed frame to write into. It's reused only if it has the same shape and
+                dtype, in which case its padding already holds the right color and only the frame area is copied.
 
         Returns:
             cv2.typing.MatLike: The letterboxed frame (as cv2 supported format - numpy like).
@@ -150,71 +297,16 @@ class USBCamera:
         if w != h:
             # Letterbox: add padding to make it square (yolo colors)
             size = max(h, w)
-            return cv2.copyMakeBorder(
-                frame,
-                top=(size - h) // 2,
-                bottom=(size - h + 1) // 2,
-                left=(size - w) // 2,
-                right=(size - w + 1) // 2,
-                borderType=cv2.BORDER_CONSTANT,
-                value=(114, 114, 114),
-            )
+            shape = (size, size) + frame.shape[2:]
+            if dst is None or dst.shape != shape or dst.dtype != frame.dtype:
+                dst = np.full(shape, 114, dtype=frame.dtype)
+            top = (size - h) // 2
+            left = (size - w) // 2
+            dst[top : top + h, left : left + w] = frame
+            return dst
         else:
             return frame
 
-    def _get_video_devices_by_index(self):
-        """Reads symbolic links in /dev/v4l/by-id/, resolves them, and returns a
-        dictionary mapping the numeric index to the system /dev/videoX device.
-
-        Returns:
-            dict[int, str]: a dict where keys are ordinal integer indices (e.g., 0, 1) and values are the
-            /dev/videoX device names (e.g., "0", "1").
-        """
-        devices_by_index = {}
-        directory_path = "/dev/v4l/by-id/"
-
-        # Check if the directory exists
-        if not os.path.exists(directory_path):
-            logger.error(f"Error: Directory '{directory_path}' not found.")
-            return devices_by_index
-
-        try:
-            # List all entries in the directory
-            entries = os.listdir(directory_path)
-
-            for entry in entries:
-                full_path = os.path.join(directory_path, entry)
-
-                # Check if the entry is a symbolic link
-                if os.path.islink(full_path):
-                    # Use a regular expression to find the numeric index at the end of the filename
-                    match = re.search(r"index(\d+)$", entry)
-                    if match:
-                        index_str = match.group(1)
-                        try:
-                            index = int(index_str)
-
-                            # Resolve the symbolic link to its absolute path
-                            resolved_path = os.path.realpath(full_path)
-
-                            # Get just the filename (e.g., "video0") from the resolved path
-                            device_name = os.path.basename(resolved_path)
-
-                            # Remove the "video" prefix to get just the number
-                            device_number = device_name.replace("video", "")
-
-                            # Add the index and device number to the dictionary
-                            devices_by_index[index] = device_number
-
-                        except ValueError:
-                            logger.warning(f"Warning: Could not convert index '{index_str}' to an integer for '{entry}'. Skipping.")
-                            continue
-        except OSError as e:
-            logger.error(f"Error accessing directory '{directory_path}': {e}")
-            return devices_by_index
-
-        return devices_by_index
-
     def start(self):
         """Starts the camera capture."""
         with self._cap_lock:
@@ -228,6 +320,18 @@ class USBCamera:
             self._cap = temp_cap  # Assign only after successful initialization
             self._last_capture_time_monotonic = time.monotonic()
 
+            # Ask for MJPG before the resolution and FPS, which depend on the pixel format: compressed frames take
+            # far less USB bandwidth than YUYV, allowing higher resolutions and frame rates. Cameras without MJPG
+            # keep their default format.
+            if not self._cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG")):
+                logger.debug(f"Camera {self.camera} does not support MJPG, using its default pixel format.")
+
+            if self.fps > 0:
+                # Let the driver pace the frames too, and keep only the latest one queued so that reads never get a
+                # stale frame
+                self._cap.set(cv2.CAP_PROP_FPS, float(self.fps))
+                self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
             if self.resolution[0] is not None and self.resolution[1] is not None:
                 self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
                 self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
@@ -240,8 +344,20 @@ class USBCamera:
                         f"actual resolution: {int(actual_width)}x{int(actual_height)}",
                     )
 
+            if self.background_grab:
+                self._grab_stop.clear()
+                self._frame_grabbed.clear()
+                self._grab_failed = False
+                self._grab_thread = threading.Thread(target=self._grab_loop, name=f"USBCameraGrab-{self.camera}", daemon=True)
+                self._grab_thread.start()
+
     def stop(self):
         """Stops the camera and releases its resources."""
+        if self._grab_thread is not None:
+            # Joined without the lock, which the grab thread needs to finish its last grab
+            self._grab_stop.set()
+            self._grab_thread.join(timeout=5)
+            self._grab_thread = None
         with self._cap_lock:
             if self._cap is not None:
                 self._cap.release()
@@ -10,6 +10,7 @@ from setuptools.build_meta import build_editable as _orig_build_editable
 from setuptools_scm import get_version
 import subprocess
 import shutil
+import concurrent.futures
 
 
 def run_preprocessing(dev_mode: bool = False) -> None:
@@ -28,34 +29,45 @@ def run_preprocessing(dev_mode: bool = False) -> None:
         shutil.rmtree(cache_folder_path)
     os.makedirs(cache_folder_path, exist_ok=True)
 
-    try:
-        print(f"################################## Building bricks list Version: {version} - Dev Mode: {dev_mode} ##################################")
-        cmd = ["arduino-bricks-release", "-o", f"{cache_folder_path}/bricks-list.yaml", "--version", f"{version}"]
-        if registry:
-            cmd.append("--registry")
-            cmd.append(registry)
-        if dev_mode:
-            cmd.append("--dev")
-
-        subprocess.run(cmd, check=True, cwd=os.getcwd())
-    except Exception as e:
-        print(f"Error: {e}.")
-        raise
-
-    try:
-        print(f"################################## Pre-provision bricks list #######################################################################")
-        cmd = ["arduino-bricks-list-modules", "-p", "-b", "-c", f"{cache_folder_path}"]
-        subprocess.run(cmd, check=True, cwd=os.getcwd())
-    except Exception as e:
-        print(f"Error: {e}.")
-        raise
-
-    try:
-        print(f"################################## Embed models list ###############################################################################")
-        shutil.copyfile("models/models-list.yaml", f"{cache_folder_path}/models-list.yaml")
-    except Exception as e:
-        print(f"Error: {e}.")
-        raise
+    def build_bricks_list():
+        try:
+            print(f"################################## Building bricks list Version: {version} - Dev Mode: {dev_mode} ##################################")
+            cmd = ["arduino-bricks-release", "-o", f"{cache_folder_path}/bricks-list.yaml", "--version", f"{version}"]
+            if registry:
+                cmd.append("--registry")
+                cmd.append(registry)
+            if dev_mode:
+                cmd.append("--dev")
+
+            subprocess.run(cmd, check=True, cwd=os.getcwd())
+        except Exception as e:
+            print(f"Error: {e}.")
+            raise
+
+        # Needs the bricks list built above
+        try:
+            print(f"################################## Pre-provision bricks list #######################################################################")
+            cmd = ["arduino-bricks-list-modules", "-p", "-b", "-c", f"{cache_folder_path}"]
+            subprocess.run(cmd, check=True, cwd=os.getcwd())
+        except Exception as e:
+            print(f"Error: {e}.")
+            raise
+
+    def embed_models_list():
+        try:
+            print(f"################################## Embed models list ###############################################################################")
+            shutil.copyfile("models/models-list.yaml", f"{cache_folder_path}/models-list.yaml")
+        except Exception as e:
+            print(f"Error: {e}.")
+            raise
+
+    # The bricks list commands and the models list copy are independent of each other: they run in worker threads
+    # (subprocess.run() releases the GIL while waiting), with a single subprocess at a time. The docs are generated
+    # last, once both are complete.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(build_bricks_list), executor.submit(embed_models_list)]
+        for future in futures:
+            future.result()  # Raises the exception of a failed step
 
     try:
         print("################################### Docs generation #################################################################################")
@@ -15,6 +15,9 @@ class SlidingWindowBuffer:
     repeated but newer data (with slide_amount length) is always available.
     By providing a slide_amount == window_size, the buffer implements a tumbling window where older data
     is never repeated and only new data (with window_size length) is always available.
+
+    The storage is a single preallocated ring of capacity items. Each pulled window is copied into a new array,
+    unless pull() is given a destination to reuse, which avoids any allocation per window.
     """
 
     def __init__(self, window_size: int, slide_amount: int, capacity: int = None):
@@ -108,16 +111,21 @@ class SlidingWindowBuffer:
 
         return True
 
-    def pull(self, timeout: float = None) -> np.ndarray:
+    def pull(self, timeout: float = None, out: np.ndarray = None) -> np.ndarray:
         """Retrieves a window of data as a NumPy array.
         Blocks until a window of window_size with at least slide_amount of
         new data is available or the provided timeout expires.
 
         Args:
             timeout (float, optional): The maximum time to wait for data. If None, waits indefinitely.
+            out (np.ndarray, optional): An array of window_size items, with the buffer's item shape and dtype, to
+                copy the window into instead of a new array, e.g. to reuse the same one for every pull.
 
         Returns:
-            np.ndarray: A NumPy array containing the data in the sliding window.
+            np.ndarray: A NumPy array containing the data in the sliding window, out if provided.
+
+        Raises:
+            ValueError: If out has the wrong shape or dtype.
         """
         with self._condition:
             has_data = self._condition.wait_for(lambda: self.has_data(), timeout=timeout)
@@ -132,13 +140,21 @@ class SlidingWindowBuffer:
             start = self._read_index
             end = start + self.window_size
 
+            if out is None:
+                window = np.empty((self.window_size,) + self._buffer.shape[1:], dtype=self._dtype)
+            elif out.shape != (self.window_size,) + self._buffer.shape[1:] or out.dtype != self._dtype:
+                raise ValueError(f"out must have shape {(self.window_size,) + self._buffer.shape[1:]} and dtype {self._dtype}")
+            else:
+                window = out
+
             if end <= self.capacity:
-                # No wrap-around: return a direct view of the data. O(1) operation.
-                window = self._buffer[start:end]
+                # No wrap-around: a single copy
+                window[:] = self._buffer[start:end]
             else:
-                # Wraps around: concatenate two views. Creates a copy.
-                end_wrapped = end % self.capacity
-                window = np.concatenate((self._buffer[start:], self._buffer[:end_wrapped]))
+                # Wraps around: copy the two parts
+                part1_len = self.capacity - start
+                window[:part1_len] = self._buffer[start:]
+                window[part1_len:] = self._buffer[: end % self.capacity]
 
             self._read_index = (self._read_index + self.slide_amount) % self.capacity
             self._data_count -= self.slide_amount